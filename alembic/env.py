@@ -1,11 +1,16 @@
 """Alembic migration environment."""
+import importlib.util
+import os
+import pickle
 from logging.config import fileConfig
 
 from alembic import context
-from sqlalchemy import engine_from_config, pool
+from sqlalchemy import engine_from_config
 
-from mimir.config import settings
-from mimir.models import Base
+from mimir.config import get_settings
+from mimir.db import pool_options
+
+settings = get_settings()
 
 # this is the Alembic Config object, which provides
 # the values of the [alembic] section of the .ini file.
@@ -15,33 +20,71 @@ config = context.config
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
+
+
+def load_target_metadata():
+    """Return the models' MetaData, optionally via an on-disk pickle.
+
+    When ALEMBIC_METADATA_CACHE names a file, the pickled MetaData is reused
+    as long as mimir/models.py is unchanged (keyed by its mtime and size).
+    """
+    cache_path = os.environ.get("ALEMBIC_METADATA_CACHE")
+    if not cache_path:
+        from mimir.models import Base
+
+        return Base.metadata
+
+    models_stat = os.stat(importlib.util.find_spec("mimir.models").origin)
+    cache_key = (models_stat.st_mtime_ns, models_stat.st_size)
+    try:
+        with open(cache_path, "rb") as f:
+            cached_key, metadata = pickle.load(f)
+        if cached_key == cache_key:
+            return metadata
+    except (OSError, EOFError, pickle.UnpicklingError, ValueError):
+        pass
+
+    from mimir.models import Base
+
+    with open(cache_path, "wb") as f:
+        pickle.dump((cache_key, Base.metadata), f)
+    return Base.metadata
+
+
 # add your model's MetaData object here
 # for 'autogenerate' support
-# from myapp import mymodel
-# target_metadata = mymodel.Base.metadata
-target_metadata = Base.metadata
+target_metadata = load_target_metadata()
 
 
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode."""
-    configuration = config.get_section(config.config_ini_section)
-    configuration["sqlalchemy.url"] = settings.database_url
+    context.configure(
+        url=settings.database_url,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
 
     with context.begin_transaction():
-        context.execute(f"CREATE SCHEMA IF NOT EXISTS {context.bind}")
         context.run_migrations()
 
 
 def run_migrations_online() -> None:
     """Run migrations in 'online' mode."""
-    configuration = config.get_section(config.config_ini_section)
-    configuration["sqlalchemy.url"] = settings.database_url
+    if settings.alembic_use_app_engine:
+        # Share the application's engine and pool when running in-process
+        from mimir.db import get_db_manager
 
-    connectable = engine_from_config(
-        configuration,
-        prefix="sqlalchemy.",
-        poolclass=pool.NullPool,
-    )
+        connectable = get_db_manager().engine
+    else:
+        configuration = config.get_section(config.config_ini_section)
+        configuration["sqlalchemy.url"] = settings.database_url
+
+        connectable = engine_from_config(
+            configuration,
+            prefix="sqlalchemy.",
+            **pool_options(settings.database_url),
+        )
 
     with connectable.connect() as connection:
         context.configure(connection=connection, target_metadata=target_metadata)
@@ -50,6 +93,15 @@ def run_migrations_online() -> None:
             context.run_migrations()
 
 
+def is_downgrade() -> bool:
+    """Return True when invoked as `alembic downgrade ...` from the command line."""
+    cmd = getattr(config.cmd_opts, "cmd", None)
+    return bool(cmd) and cmd[0].__name__ == "downgrade"
+
+
+if is_downgrade() and not settings.allow_downgrade:
+    raise RuntimeError("Downgrades are disabled (set ALLOW_DOWNGRADE=true to enable)")
+
 if context.is_offline_mode():
     run_migrations_offline()
 else:
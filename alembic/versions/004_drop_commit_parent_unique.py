@@ -0,0 +1,23 @@
+"""Drop redundant unique constraint on commit_parents.
+
+Revision ID: 004_drop_commit_parent_unique
+Revises: 003_add_projects
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "004_drop_commit_parent_unique"
+down_revision = "003_add_projects"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The (child_id, parent_id) primary key already enforces uniqueness
+    op.execute("ALTER TABLE commit_parents DROP CONSTRAINT IF EXISTS uq_commit_parent")
+
+
+def downgrade() -> None:
+    op.create_unique_constraint("uq_commit_parent", "commit_parents", ["child_id", "parent_id"])
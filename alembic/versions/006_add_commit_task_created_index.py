@@ -0,0 +1,30 @@
+"""Index context_commits by (task_id, created_at).
+
+Revision ID: 006_commit_task_created_index
+Revises: 004_drop_commit_parent_unique
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "006_commit_task_created_index"
+down_revision = "004_drop_commit_parent_unique"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Per-task commit listings ordered by time become an index range scan with
+    # no sort node; the old task_id-only index is a prefix of this one.
+    # Built inside the migration's transaction, so a failure rolls back
+    # cleanly instead of leaving an INVALID index behind.
+    op.create_index(
+        "ix_context_commits_task_created", "context_commits", ["task_id", "created_at"]
+    )
+    op.drop_index("ix_context_commits_task_id", table_name="context_commits")
+
+
+def downgrade() -> None:
+    op.create_index("ix_context_commits_task_id", "context_commits", ["task_id"])
+    op.drop_index("ix_context_commits_task_created", table_name="context_commits")
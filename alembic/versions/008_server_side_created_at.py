@@ -0,0 +1,37 @@
+"""Make created_at TIMESTAMPTZ with a server-side default.
+
+Revision ID: 008_server_side_created_at
+Revises: 006_commit_task_created_index
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "008_server_side_created_at"
+down_revision = "006_commit_task_created_index"
+branch_labels = None
+depends_on = None
+
+TABLES = ("projects", "tasks", "context_commits", "branches")
+
+
+def upgrade() -> None:
+    # Existing values were written by datetime.utcnow(), i.e. naive UTC.
+    # clock_timestamp() rather than now(): now() is fixed for the whole
+    # transaction, so commits written together would share a timestamp
+    for table in TABLES:
+        op.execute(
+            f"ALTER TABLE {table} "
+            "ALTER COLUMN created_at TYPE TIMESTAMPTZ USING created_at AT TIME ZONE 'UTC', "
+            "ALTER COLUMN created_at SET DEFAULT clock_timestamp()"
+        )
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.execute(
+            f"ALTER TABLE {table} "
+            "ALTER COLUMN created_at DROP DEFAULT, "
+            "ALTER COLUMN created_at TYPE TIMESTAMP USING created_at AT TIME ZONE 'UTC'"
+        )
@@ -0,0 +1,44 @@
+"""Compress context_commits.full_context with lz4.
+
+Revision ID: 009_lz4_full_context
+Revises: 008_server_side_created_at
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "009_lz4_full_context"
+down_revision = "008_server_side_created_at"
+branch_labels = None
+depends_on = None
+
+
+def _lz4_available() -> bool:
+    # default_toast_compression exists from PostgreSQL 14 (together with
+    # per-column compression) and only lists lz4 when the server was built
+    # with it. Offline (--sql) runs cannot ask, so they leave the column as is.
+    if op.get_context().as_sql:
+        return False
+    return bool(
+        op.get_bind().scalar(
+            sa.text(
+                "SELECT 'lz4' = ANY(enumvals) FROM pg_settings "
+                "WHERE name = 'default_toast_compression'"
+            )
+        )
+    )
+
+
+def upgrade() -> None:
+    # Large contexts are TOASTed; lz4 compresses and decompresses them much
+    # faster than the default pglz at a similar ratio. Applies to values
+    # written from now on; existing rows keep pglz until rewritten.
+    if _lz4_available():
+        op.execute("ALTER TABLE context_commits ALTER COLUMN full_context SET COMPRESSION lz4")
+
+
+def downgrade() -> None:
+    if _lz4_available():
+        op.execute("ALTER TABLE context_commits ALTER COLUMN full_context SET COMPRESSION pglz")
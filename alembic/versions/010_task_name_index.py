@@ -0,0 +1,31 @@
+"""Index tasks by name and drop indexes shadowed by unique constraints.
+
+Revision ID: 010_task_name_index
+Revises: 009_lz4_full_context
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "010_task_name_index"
+down_revision = "009_lz4_full_context"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Every command resolves the current task by name alone, which the
+    # (project_id, name) unique index cannot serve. The dropped indexes are
+    # covered by uq_task_branch_name (task_id is its prefix) and
+    # uq_projects_name; commit_parents child lookups use its primary key.
+    # As in 006, no CONCURRENTLY: a failed build rolls back with the migration.
+    op.create_index("ix_tasks_name", "tasks", ["name"])
+    op.drop_index("ix_branches_task_id", table_name="branches")
+    op.drop_index("ix_projects_name", table_name="projects")
+
+
+def downgrade() -> None:
+    op.create_index("ix_projects_name", "projects", ["name"])
+    op.create_index("ix_branches_task_id", "branches", ["task_id"])
+    op.drop_index("ix_tasks_name", table_name="tasks")
@@ -10,6 +10,10 @@ echo "Installing mimir-mvp..."
 # Install the package in editable mode
 pip install -e .
 
+# Precompile bytecode so the first `mimir` run does not pay for compiling
+# the CLI and its command modules
+python -m compileall -q mimir
+
 # Run database migrations
 alembic upgrade head
 
@@ -1,10 +1,30 @@
 """Mimir - Cognitive Context Management System."""
+import importlib
+from typing import Any
 
 __version__ = "0.2.0"
 
-from mimir.config import logger, settings
-from mimir.db import db_manager
-from mimir.models import Branch, ContextCommit, CommitParent, Task
+# Public attributes resolved on first access (PEP 562), so `import mimir`
+# does not build settings, the engine, or ORM metadata up front.
+_LAZY_ATTRS = {
+    "logger": "mimir.config",
+    "settings": "mimir.config",
+    "db_manager": "mimir.db",
+    "Task": "mimir.models",
+    "ContextCommit": "mimir.models",
+    "CommitParent": "mimir.models",
+    "Branch": "mimir.models",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     "logger",
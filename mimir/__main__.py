@@ -0,0 +1,32 @@
+"""Entry point for `mimir` and `python -m mimir`.
+
+A few invocations are answered here without importing Typer/Click, which
+cost more to load than these commands take to run. Everything else goes
+to the full CLI in `mimir.cli`.
+"""
+import sys
+
+
+def main() -> None:
+    """Route fast-path invocations, otherwise hand over to the Typer app."""
+    args = sys.argv[1:]
+
+    if args in (["--version"], ["-v"]):
+        from mimir.output import print_version
+
+        print_version()
+        return
+
+    if args == ["status"]:
+        from mimir.handlers.status import handle_status
+
+        handle_status()
+        return
+
+    from mimir.cli import main as cli_main
+
+    cli_main()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,48 +1,41 @@
 """CLI interface for Mimir - streamlined dispatcher delegating to handlers and output."""
+import functools
 from pathlib import Path
 from typing import Optional
-from uuid import UUID
 
 import typer
 
-from mimir.config import settings
-from mimir.logger import logger
-from mimir.db import db_manager
-from mimir.handlers import (
-    handle_branch,
-    handle_commit,
-    handle_context,
-    handle_create_project,
-    handle_create_task,
-    handle_list_projects,
-    handle_list_tasks,
-    handle_history,
-    handle_init,
-    handle_show,
-    handle_status,
-    handle_switch,
-)
+from mimir.config import report_error
 from mimir.output import print_error, print_version
-from mimir.services.branch_service import BranchService
-from mimir.services.commit_service import CommitService
-from mimir.services.task_service import TaskService
-from mimir.state_manager import StateManager
 
-app = typer.Typer(help="Mimir - Cognitive Context Management System")
+__all__ = ["build_app", "main"]
+
+
+def cli_handler(func):
+    """Decorator: turn handler errors into an error message and exit code 1.
 
+    ValueError is a domain error already explained to the user; anything else
+    is unexpected and is logged via `report_error` (traceback with DEBUG=true).
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        except typer.Exit:
+            raise
+        except ValueError as e:
+            print_error(str(e))
+            raise typer.Exit(1)
+        except Exception as e:
+            report_error(func.__name__, e)
+            print_error(str(e))
+            raise typer.Exit(1)
 
-def get_services():
-    """Helper to get services."""
-    session = db_manager.get_session()
-    return {
-        "task_service": TaskService(session),
-        "commit_service": CommitService(session),
-        "branch_service": BranchService(session),
-        "session": session,
-    }
+    return wrapper
 
 
-@app.command()
+@cli_handler
 def init(
     database_url: Optional[str] = typer.Option(
         None,
@@ -51,15 +44,12 @@ def init(
     ),
 ) -> None:
     """Initialize Mimir database."""
-    try:
-        handle_init(database_url)
-    except Exception as e:
-        logger.exception("Unexpected error in init")
-        print_error(str(e))
-        raise typer.Exit(1)
+    from mimir.handlers import handle_init
+
+    handle_init(database_url)
 
 
-@app.command()
+@cli_handler
 def create_task(
     name: str = typer.Argument(..., help="Task name (e.g., TASK-42)"),
     project: str = typer.Option(..., "--project", help="Project name (required)"),
@@ -70,18 +60,12 @@ def create_task(
     context: Optional[str] = typer.Option(None, "--context", help="Inline context"),
 ) -> None:
     """Create a new task with main branch."""
-    try:
-        handle_create_task(project, name, author, external_id, message, context_file, context)
-    except ValueError as e:
-        print_error(str(e))
-        raise typer.Exit(1)
-    except Exception as e:
-        logger.exception("Unexpected error in create_task")
-        print_error(str(e))
-        raise typer.Exit(1)
-
-
-@app.command()
+    from mimir.handlers import handle_create_task
+
+    handle_create_task(project, name, author, external_id, message, context_file, context)
+
+
+@cli_handler
 def commit(
     task: Optional[str] = typer.Option(None, "--task", help="Task name"),
     branch: Optional[str] = typer.Option(None, "--branch", help="Branch name"),
@@ -95,18 +79,12 @@ def commit(
     uncertainty: Optional[int] = typer.Option(None, "--uncertainty", help="Uncertainty (0-10)"),
 ) -> None:
     """Create a new commit on a branch."""
-    try:
-        handle_commit(task, branch, message, context_file, context, author, cognitive_load, uncertainty)
-    except ValueError as e:
-        print_error(str(e))
-        raise typer.Exit(1)
-    except Exception as e:
-        logger.exception("Unexpected error in commit")
-        print_error(str(e))
-        raise typer.Exit(1)
-
-
-@app.command()
+    from mimir.handlers import handle_commit
+
+    handle_commit(task, branch, message, context_file, context, author, cognitive_load, uncertainty)
+
+
+@cli_handler
 def branch(
     action: str = typer.Argument("list", help="Action: list, create, delete"),
     name: Optional[str] = typer.Argument(None, help="Branch name"),
@@ -114,77 +92,62 @@ def branch(
     from_branch: Optional[str] = typer.Option(None, "--from", help="Create from branch"),
 ) -> None:
     """Manage branches."""
-    try:
-        handle_branch(action, name, task, from_branch)
-    except ValueError as e:
-        print_error(str(e))
-        raise typer.Exit(1)
-    except Exception as e:
-        logger.exception("Unexpected error in branch")
-        print_error(str(e))
-        raise typer.Exit(1)
-
-
-@app.command()
+    from mimir.handlers import handle_branch
+
+    handle_branch(action, name, task, from_branch)
+
+
+@cli_handler
 def switch(
     task: Optional[str] = typer.Option(None, "--task", help="Task name"),
     branch: Optional[str] = typer.Option(None, "--branch", help="Branch name"),
 ) -> None:
     """Switch current task and/or branch."""
-    try:
-        handle_switch(task, branch)
-    except Exception as e:
-        logger.exception("Unexpected error in switch")
-        print_error(str(e))
-        raise typer.Exit(1)
+    from mimir.handlers import handle_switch
+
+    handle_switch(task, branch)
 
 
-@app.command()
+@cli_handler
 def history(
     task: Optional[str] = typer.Option(None, "--task", help="Task name"),
     branch: Optional[str] = typer.Option(None, "--branch", help="Branch name"),
     limit: int = typer.Option(20, "--limit", help="Maximum commits to show"),
+    summary: bool = typer.Option(
+        False, "--summary", help="Also show load/uncertainty averages for the task"
+    ),
 ) -> None:
     """Show commit history for a branch."""
-    try:
-        handle_history(task, branch, limit)
-    except ValueError as e:
-        print_error(str(e))
-        raise typer.Exit(1)
-    except Exception as e:
-        logger.exception("Unexpected error in history")
-        print_error(str(e))
-        raise typer.Exit(1)
-
-
-@app.command()
+    from mimir.handlers import handle_history
+
+    handle_history(task, branch, limit, summary)
+
+
+@cli_handler
 def show(
     commit_id: str = typer.Argument(..., help="Commit ID (full or short)"),
 ) -> None:
     """Show full context of a commit."""
-    try:
-        handle_show(commit_id)
-    except ValueError as e:
-        print_error(str(e))
-        raise typer.Exit(1)
-    except Exception as e:
-        logger.exception("Unexpected error in show")
-        print_error(str(e))
-        raise typer.Exit(1)
-
-
-@app.command()
+    from mimir.handlers.commit import COMMIT_ID_RE
+
+    if not COMMIT_ID_RE.fullmatch(commit_id):
+        print_error(f"Invalid commit ID: {commit_id}")
+        raise typer.Exit(2)
+
+    from mimir.handlers import handle_show
+
+    handle_show(commit_id)
+
+
+@cli_handler
 def status() -> None:
     """Show current status."""
-    try:
-        handle_status()
-    except Exception as e:
-        logger.exception("Unexpected error in status")
-        print_error(str(e))
-        raise typer.Exit(1)
+    from mimir.handlers import handle_status
+
+    handle_status()
 
 
-@app.command()
+@cli_handler
 def context(
     task: Optional[str] = typer.Option(None, "--task", help="Task name (defaults to current task)"),
     branch: Optional[str] = typer.Option(None, "--branch", help="If provided, limit to this branch"),
@@ -194,58 +157,39 @@ def context(
 
     If `--branch` is provided, shows contexts only from that branch's history.
     """
-    try:
-        handle_context(task, branch, reverse)
-    except Exception as e:
-        logger.exception("Unexpected error in context")
-        print_error(str(e))
-        raise typer.Exit(1)
+    from mimir.handlers import handle_context
+
+    handle_context(task, branch, reverse)
 
 
-@app.command()
+@cli_handler
 def tasks(project: Optional[str] = typer.Option(None, "--project", help="Filter tasks by project")) -> None:
     """List all tasks with stats, optionally filtered by project."""
-    try:
-        handle_list_tasks(project=project)
-    except ValueError as e:
-        print_error(str(e))
-        raise typer.Exit(1)
-    except Exception as e:
-        logger.exception("Unexpected error in tasks")
-        print_error(str(e))
-        raise typer.Exit(1)
-
-
-@app.command()
+    from mimir.handlers import handle_list_tasks
+
+    handle_list_tasks(project=project)
+
+
+@cli_handler
 def create_project(
     name: str = typer.Argument(..., help="Project name"),
     parent: Optional[str] = typer.Option(None, "--parent", help="Parent project name (for hierarchy)"),
 ) -> None:
     """Create a new project."""
-    try:
-        handle_create_project(name, parent=parent)
-    except ValueError as e:
-        print_error(str(e))
-        raise typer.Exit(1)
-    except Exception as e:
-        logger.exception("Unexpected error in create_project")
-        print_error(str(e))
-        raise typer.Exit(1)
-
-
-@app.command()
+    from mimir.handlers import handle_create_project
+
+    handle_create_project(name, parent=parent)
+
+
+@cli_handler
 def projects() -> None:
     """List all projects in hierarchical view."""
-    try:
-        handle_list_projects()
-    except Exception as e:
-        logger.exception("Unexpected error in projects")
-        print_error(str(e))
-        raise typer.Exit(1)
+    from mimir.handlers import handle_list_projects
+
+    handle_list_projects()
 
 
-@app.callback()
-def main(
+def root(
     version: bool = typer.Option(
         None,
         "--version",
@@ -260,5 +204,44 @@ def main(
         raise typer.Exit()
 
 
+COMMANDS = (
+    init,
+    create_task,
+    commit,
+    branch,
+    switch,
+    history,
+    show,
+    status,
+    context,
+    tasks,
+    create_project,
+    projects,
+)
+
+
+@functools.lru_cache(maxsize=1)
+def build_app() -> typer.Typer:
+    """Build the Typer app on first use, so importing this module stays cheap."""
+    # No markup in help text and plain tracebacks: both skip Rich rendering work
+    app = typer.Typer(
+        help="Mimir - Cognitive Context Management System",
+        rich_markup_mode=None,
+        pretty_exceptions_enable=False,
+    )
+    app.callback()(root)
+    for command in COMMANDS:
+        app.command()(command)
+    return app
+
+
+def main() -> None:
+    """Console-script entry point."""
+    from mimir.config import setup_logging
+
+    setup_logging()
+    build_app()()
+
+
 if __name__ == "__main__":
-    app()
+    main()
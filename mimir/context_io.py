@@ -0,0 +1,52 @@
+"""Reading context files for commits."""
+import io
+import os
+import stat
+from pathlib import Path
+
+# Above this size regular files are read with os.read calls sized from fstat
+LARGE_FILE_SIZE = 1 << 20
+
+
+def _read_bytes(path: str) -> bytes:
+    """Read a whole file with as few copies and syscalls as possible.
+
+    Large regular files are read straight from the descriptor into one buffer
+    of the size reported by fstat. Everything else (small files, pipes and
+    other streams whose size is unknown) goes through one buffered read.
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        st = os.fstat(fd)
+        if stat.S_ISREG(st.st_mode) and st.st_size > LARGE_FILE_SIZE:
+            chunks = []
+            remaining = st.st_size
+            while remaining > 0:
+                chunk = os.read(fd, remaining)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                remaining -= len(chunk)
+            # The file may have grown since fstat; pick up the rest
+            tail = os.read(fd, io.DEFAULT_BUFFER_SIZE)
+            while tail:
+                chunks.append(tail)
+                tail = os.read(fd, io.DEFAULT_BUFFER_SIZE)
+            return chunks[0] if len(chunks) == 1 else b"".join(chunks)
+
+        with open(fd, "rb", buffering=io.DEFAULT_BUFFER_SIZE * 16, closefd=False) as f:
+            return f.read()
+    finally:
+        os.close(fd)
+
+
+def read_context_file(path: Path) -> str:
+    """Return the text of a context file.
+
+    Binary mode skips TextIOWrapper's incremental decoding and newline
+    translation; the bytes are decoded in a single call.
+
+    Raises:
+        OSError: If the file cannot be read
+    """
+    return _read_bytes(os.fspath(path)).decode("utf-8")
@@ -1,12 +1,64 @@
 """Database connection and session management."""
+import functools
 from contextlib import contextmanager
-from typing import Generator
+from typing import Any, Generator
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy import Engine, create_engine, event
+from sqlalchemy.orm import Session, scoped_session, sessionmaker
+from sqlalchemy.pool import QueuePool
 
 from mimir.config import settings
-from mimir.models import Base
+
+
+def pool_options(database_url: str) -> dict[str, Any]:
+    """Return QueuePool options for `create_engine`.
+
+    SQLite uses its own single-connection pools which reject these options.
+    """
+    if database_url.startswith("sqlite"):
+        return {}
+    return {
+        "poolclass": QueuePool,
+        "pool_size": settings.database_pool_size,
+        "max_overflow": settings.database_max_overflow,
+        "pool_timeout": settings.database_pool_timeout,
+        "pool_recycle": settings.database_pool_recycle,
+        "pool_pre_ping": settings.database_pool_pre_ping,
+        "pool_use_lifo": settings.database_pool_use_lifo,
+    }
+
+
+def transaction_cache(session: Session, name: str) -> dict[Any, Any]:
+    """Return the dict `name` cached on `session` for its current transaction.
+
+    The caches live in `session.info` and are emptied whenever a transaction
+    of the session ends: commit, rollback, or a close without either (as
+    read-only handlers do). Nothing cached outlives the transaction that
+    read it or leaks into other sessions.
+    """
+    caches = session.info.get("transaction_caches")
+    if caches is None:
+        caches = session.info["transaction_caches"] = {}
+
+        def clear(*args: Any) -> None:
+            caches.clear()
+
+        event.listen(session, "after_transaction_end", clear)
+    return caches.setdefault(name, {})
+
+
+def insert_ignoring_conflicts(session: Session, model: Any) -> Any:
+    """Return an INSERT into `model` that skips rows hitting a unique constraint.
+
+    `INSERT ... ON CONFLICT DO NOTHING`: with `.returning(model)`, a conflict
+    yields no row, so a uniqueness check and the insert are one statement
+    with no race between them.
+    """
+    if session.get_bind().dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        from sqlalchemy.dialects.postgresql import insert
+    return insert(model).on_conflict_do_nothing()
 
 
 class DatabaseManager:
@@ -14,24 +66,62 @@ class DatabaseManager:
 
     def __init__(self, database_url: str):
         """Initialize database manager."""
+        self.database_url = database_url
+        engine_options = pool_options(database_url)
+        if settings.database_isolation_level:
+            engine_options["isolation_level"] = settings.database_isolation_level
         self.engine = create_engine(
             database_url,
             echo=settings.database_echo,
             future=True,
+            query_cache_size=settings.database_query_cache_size,
+            insertmanyvalues_page_size=settings.database_insertmanyvalues_page_size,
+            **engine_options,
         )
         self.SessionLocal = sessionmaker(
             bind=self.engine,
             class_=Session,
             expire_on_commit=False,
         )
+        # One session per thread. Closing it (as handlers do) returns its
+        # connection to the pool; the registry hands the same session out again
+        self.ScopedSession = scoped_session(self.SessionLocal)
+
+    def init_db(self, database_url: str | None = None) -> None:
+        """Create all tables.
+
+        Uses the pooled engine unless `database_url` names another database,
+        which then gets a one-off engine.
+        """
+        from mimir.models import Base, init_db
 
-    def init_db(self) -> None:
-        """Create all tables."""
+        if database_url and database_url != self.database_url:
+            init_db(database_url)
+            return
         Base.metadata.create_all(self.engine)
 
+    def readonly_execution_options(self) -> dict[str, Any]:
+        """Connection options for transactions that only read.
+
+        Postgres gets READ COMMITTED and READ ONLY (no snapshot held across
+        statements, no write bookkeeping); other backends keep their defaults.
+        """
+        if not self.database_url.startswith("postgresql"):
+            return {}
+        return {"isolation_level": "READ COMMITTED", "postgresql_readonly": True}
+
+    @functools.cached_property
+    def readonly_engine(self) -> Engine:
+        """The engine with `readonly_execution_options()` on its connections.
+
+        It shares the engine's pool. The options are applied to a connection
+        when it is checked out, so binding a session to it connects nothing.
+        """
+        return self.engine.execution_options(**self.readonly_execution_options())
+
     def get_session(self) -> Session:
-        """Get a new database session."""
-        return self.SessionLocal()
+        """Get the current thread's database session."""
+        return self.ScopedSession()
 
     @contextmanager
     def session_context(self) -> Generator[Session, None, None]:
@@ -47,10 +137,19 @@ class DatabaseManager:
             session.close()
 
 
-# Global database manager instance
-db_manager = DatabaseManager(settings.database_url)
+@functools.cache
+def get_db_manager() -> DatabaseManager:
+    """Return the global database manager, creating the engine on first use."""
+    return DatabaseManager(settings.database_url)
+
+
+def __getattr__(name: str) -> Any:
+    # Global database manager instance, built lazily (PEP 562)
+    if name == "db_manager":
+        return get_db_manager()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def get_session() -> Session:
     """Dependency injection for getting session."""
-    return db_manager.get_session()
+    return get_db_manager().get_session()
@@ -1,10 +1,35 @@
-from .init import handle_init
-from .task import handle_create_task, handle_list_tasks
-from .commit import handle_commit, handle_history, handle_show
-from .branch import handle_branch, handle_branch_list, handle_branch_create, handle_branch_delete
-from .context import handle_context, handle_switch
-from .project import handle_create_project, handle_list_projects
-from .status import handle_status
+import importlib
+from typing import Any
+
+# Handlers are resolved on first access (PEP 562) so a command only imports
+# the handler module it runs, e.g. `status` never loads SQLAlchemy.
+_HANDLER_MODULES = {
+    "handle_init": ".init",
+    "handle_create_task": ".task",
+    "handle_list_tasks": ".task",
+    "handle_commit": ".commit",
+    "handle_history": ".commit",
+    "handle_show": ".commit",
+    "handle_branch": ".branch",
+    "handle_branch_list": ".branch",
+    "handle_branch_create": ".branch",
+    "handle_branch_delete": ".branch",
+    "handle_context": ".context",
+    "handle_switch": ".context",
+    "handle_create_project": ".project",
+    "handle_list_projects": ".project",
+    "handle_status": ".status",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _HANDLER_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     "handle_init",
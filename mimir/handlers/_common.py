@@ -3,43 +3,118 @@ from __future__ import annotations
 
 import functools
 import logging
+from contextvars import ContextVar
+from types import SimpleNamespace
 from typing import Any, Callable
 
-from mimir.db import db_manager
+from mimir.config import report_error
+from mimir.db import get_db_manager
 from mimir.output import print_error
 from mimir.state_manager import StateManager
 
 logger = logging.getLogger(__name__)
 
+# Session of the outermost running `with_session` handler, if any
+_ambient_session: ContextVar[Any] = ContextVar("mimir_session", default=None)
 
-def with_session(func: Callable[..., Any]) -> Callable[..., Any]:
-    """Decorator: provide a DB session as kwarg `session` and ensure close.
 
-    The wrapped function should accept a kwarg named `session`.
+def get_services(session) -> SimpleNamespace:
+    """Return the services bound to `session`, building them once per session.
+
+    Exposes `task`, `commit`, `branch` and `project`. `with_session` drops the
+    container when the session is closed, so instance caches in the services
+    never outlive it.
     """
+    services = getattr(session, "_services", None)
+    if services is None:
+        from mimir.services.branch_service import BranchService
+        from mimir.services.commit_service import CommitService
+        from mimir.services.project_service import ProjectService
+        from mimir.services.task_service import TaskService
+
+        services = SimpleNamespace(
+            task=TaskService(session),
+            commit=CommitService(session),
+            branch=BranchService(session),
+            project=ProjectService(session),
+        )
+        session._services = services
+    return services
+
+
+def with_session(
+    func: Callable[..., Any] | None = None, *, readonly: bool = False
+) -> Callable[..., Any]:
+    """Decorator: run the handler in one session-scoped transaction.
+
+    The wrapped function should accept a kwarg named `session`; services for
+    it are available through `get_services(session)`. The session is
+    committed when the handler returns, rolled back if it raises, and always
+    closed.
+
+    A handler called from inside another one (or given `session=`) joins that
+    session instead: it only flushes, and the outermost handler owns the
+    commit, rollback and close.
+
+    Use `@with_session(readonly=True)` for handlers that never write: their
+    session is bound to `readonly_engine` (READ COMMITTED, READ ONLY on
+    Postgres) and is not committed. The options apply when the handler first
+    queries; nothing connects before that.
+    """
+    if func is None:
+        return functools.partial(with_session, readonly=readonly)
 
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        session = db_manager.get_session()
+        outer = kwargs.get("session") or _ambient_session.get()
+        if outer is not None:
+            kwargs["session"] = outer
+            result = func(*args, **kwargs)
+            if not readonly:
+                outer.flush()
+            return result
+
+        manager = get_db_manager()
+        session = kwargs["session"] = manager.get_session()
+        token = _ambient_session.set(session)
         try:
-            kwargs.setdefault("session", session)
-            return func(*args, **kwargs)
+            if readonly:
+                session.bind = manager.readonly_engine
+            result = func(*args, **kwargs)
+            if not readonly:
+                session.commit()
+            return result
         except ValueError:
             # propagate domain errors for CLI layer to handle
+            _rollback(session)
             raise
         except Exception as e:
-            logger.exception("Unexpected error in handler %s", func.__name__)
+            _rollback(session)
+            report_error(f"handler {func.__name__}", e)
             print_error(str(e))
             raise
         finally:
+            _ambient_session.reset(token)
+            vars(session).pop("_services", None)
             try:
                 session.close()
             except Exception:
                 pass
+            if readonly:
+                # The registry hands this session out again, maybe to a writer
+                session.bind = manager.engine
 
     return wrapper
 
 
+def _rollback(session) -> None:
+    """Roll back, ignoring errors so the original exception propagates."""
+    try:
+        session.rollback()
+    except Exception:
+        pass
+
+
 def resolve_task_name(task_opt: str | None) -> str | None:
     """Return explicit task name or current task from StateManager."""
     return task_opt or StateManager.get_current_task()
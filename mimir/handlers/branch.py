@@ -9,9 +9,7 @@ from mimir.output import (
     print_branch_deleted,
     print_branches_list,
 )
-from mimir.services.branch_service import BranchService
-from mimir.services.task_service import TaskService
-from ._common import with_session, resolve_task_name
+from ._common import get_services, with_session, resolve_task_name
 
 
 def handle_branch(action: str, name: Optional[str], task: Optional[str], from_branch: Optional[str]) -> None:
@@ -41,7 +39,7 @@ def handle_branch(action: str, name: Optional[str], task: Optional[str], from_br
         raise ValueError(f"Unknown action: {action}")
 
 
-@with_session
+@with_session(readonly=True)
 def handle_branch_list(task: Optional[str], session=None) -> None:
     """List branches for task."""
     task_name = resolve_task_name(task)
@@ -50,59 +48,64 @@ def handle_branch_list(task: Optional[str], session=None) -> None:
         print_dim("No task specified. Use --task to list branches.")
         return
 
-    task_service = TaskService(session)
-    task_obj = task_service.get_task_by_name(task_name)
-    if not task_obj:
+    services = get_services(session)
+    task_id = services.task.get_task_id_by_name(task_name)
+    if not task_id:
         print_error(f"Task '{task_name}' not found")
         raise ValueError(f"Task not found")
 
-    branch_service = BranchService(session)
-    branches = branch_service.list_branches(task_obj.id)
+    branches = services.branch.list_branches(task_id)
     print_branches_list(branches, task_name)
 
 
-@with_session
 def handle_branch_create(name: str, task: str, from_branch: Optional[str], session=None) -> None:
     """Create new branch."""
-    task_service = TaskService(session)
-    task_obj = task_service.get_task_by_name(task)
+    _create_branch(name, task, from_branch, session=session)
+    # Reported only once `with_session` has committed it
+    print_branch_created(name, from_branch)
+
+
+@with_session
+def _create_branch(name: str, task: str, from_branch: Optional[str], session=None) -> None:
+    """Create the branch in one transaction."""
+    services = get_services(session)
+    task_obj = services.task.get_task_with_branches(task)
     if not task_obj:
         print_error(f"Task '{task}' not found")
         raise ValueError("Task not found")
 
-    # Get from commit
+    # Get from commit (branches are already loaded with the task)
     from_commit_id = None
     if from_branch:
-        branch_service = BranchService(session)
-        from_br = branch_service.get_branch(task_obj.id, from_branch)
+        from_br = next((b for b in task_obj.branches if b.name == from_branch), None)
         if not from_br:
             print_error(f"Branch '{from_branch}' not found")
             raise ValueError("Branch not found")
         from_commit_id = from_br.head_commit_id
 
-    branch_service = BranchService(session)
-    new_branch = branch_service.create_branch(
+    services.branch.create_branch(
         task_id=task_obj.id,
         name=name,
         from_commit_id=from_commit_id,
     )
-    session.commit()
-    print_branch_created(name, from_branch)
 
 
-@with_session
 def handle_branch_delete(task: str, name: str, session=None) -> None:
     """Delete branch."""
-    task_service = TaskService(session)
-    task_obj = task_service.get_task_by_name(task)
-    if not task_obj:
+    if not _delete_branch(task, name, session=session):
+        print_error(f"Branch '{name}' not found")
+        raise ValueError("Branch not found")
+    # Reported only once `with_session` has committed the delete
+    print_branch_deleted(name)
+
+
+@with_session
+def _delete_branch(task: str, name: str, session=None) -> bool:
+    """Delete the branch in one transaction; False if it does not exist."""
+    services = get_services(session)
+    task_id = services.task.get_task_id_by_name(task)
+    if not task_id:
         print_error(f"Task '{task}' not found")
         raise ValueError("Task not found")
 
-    branch_service = BranchService(session)
-    if branch_service.delete_branch(task_obj.id, name):
-        session.commit()
-        print_branch_deleted(name)
-    else:
-        print_error(f"Branch '{name}' not found")
-        raise ValueError("Branch not found")
+    return services.branch.delete_branch(task_id, name)
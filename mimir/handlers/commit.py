@@ -1,21 +1,30 @@
 from __future__ import annotations
 
+import re
 from pathlib import Path
 from typing import Optional
 from uuid import UUID
 
+from mimir.context_io import read_context_file
 from mimir.output import (
     print_error,
     print_commit_created,
     print_history_table,
+    print_history_summary,
     print_commit_details,
 )
-from mimir.services.commit_service import CommitService
-from mimir.services.task_service import TaskService
-from ._common import with_session, resolve_task_name
+from ._common import get_services, with_session, resolve_task_name
+
+# A full UUID (dashed or not), or a short ID as printed by `history` (first 8
+# hex digits, allowing a bit shorter); one fullmatch validates and classifies
+# the input. `mimir show` checks arguments against it before calling the handler
+COMMIT_ID_RE = re.compile(
+    r"(?P<full>[0-9a-f]{32}|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})"
+    r"|(?P<short>[0-9a-f]{6,8})",
+    re.I,
+)
 
 
-@with_session
 def handle_commit(
     task: Optional[str],
     branch: Optional[str],
@@ -28,9 +37,39 @@ def handle_commit(
     session=None,
 ) -> None:
     """Create commit on a branch."""
-    # Resolve task and branch
+    branch_name = branch or "main"
+    new_commit = _create_commit(
+        task=task,
+        branch_name=branch_name,
+        message=message,
+        context_file=context_file,
+        context=context,
+        author=author,
+        cognitive_load=cognitive_load,
+        uncertainty=uncertainty,
+        session=session,
+    )
+
+    # Reported only once `with_session` has committed it (or handed it to
+    # the caller's transaction)
+    print_commit_created(new_commit, branch_name)
+
+
+@with_session
+def _create_commit(
+    task: Optional[str],
+    branch_name: str,
+    message: str,
+    context_file: Optional[Path],
+    context: Optional[str],
+    author: str,
+    cognitive_load: Optional[int],
+    uncertainty: Optional[int],
+    session=None,
+):
+    """Create the commit in one transaction and return it."""
+    # Resolve task
     task_name = resolve_task_name(task)
-    branch_name = branch or None
 
     if not task_name:
         print_error("Task not specified and no current task set")
@@ -38,38 +77,42 @@ def handle_commit(
 
     # Get context
     if context_file:
-        context_content = context_file.read_text()
+        context_content = read_context_file(context_file)
     elif context:
         context_content = context
     else:
         print_error("No context provided (--context or --context-file)")
         raise ValueError("Context required")
 
+    services = get_services(session)
+
     # Get task ID
-    task_service = TaskService(session)
-    task_obj = task_service.get_task_by_name(task_name)
-    if not task_obj:
+    task_id = services.task.get_task_id_by_name(task_name)
+    if not task_id:
         print_error(f"Task '{task_name}' not found")
         raise ValueError(f"Task '{task_name}' not found")
 
     # Create commit
-    commit_service = CommitService(session)
-    new_commit = commit_service.create_commit(
-        task_id=task_obj.id,
-        branch_name=branch_name or "main",
+    return services.commit.create_commit(
+        task_id=task_id,
+        branch_name=branch_name,
         message=message,
         context=context_content,
         author=author,
         cognitive_load=cognitive_load,
         uncertainty=uncertainty,
     )
-    session.commit()
-    print_commit_created(new_commit, branch_name or "main")
 
 
-@with_session
-def handle_history(task: Optional[str], branch: Optional[str], limit: int, session=None) -> None:
-    """Show commit history."""
+@with_session(readonly=True)
+def handle_history(
+    task: Optional[str],
+    branch: Optional[str],
+    limit: int,
+    summary: bool = False,
+    session=None,
+) -> None:
+    """Show commit history, optionally followed by the task's metric summary."""
     task_name = resolve_task_name(task)
     branch_name = branch or None
 
@@ -77,28 +120,33 @@ def handle_history(task: Optional[str], branch: Optional[str], limit: int, sessi
         print_error("Task not specified")
         raise ValueError("Task required")
 
-    task_service = TaskService(session)
-    task_obj = task_service.get_task_by_name(task_name)
-    if not task_obj:
+    services = get_services(session)
+    task_id = services.task.get_task_id_by_name(task_name)
+    if not task_id:
         print_error(f"Task '{task_name}' not found")
         raise ValueError("Task not found")
 
-    commit_service = CommitService(session)
-    commits = commit_service.get_history(task_obj.id, branch_name or "main", limit)
+    commits = services.commit.get_history_rows(task_id, branch_name or "main", limit)
     print_history_table(commits)
+    if summary:
+        print_history_summary(services.commit.get_metrics_summary(task_id))
 
 
-@with_session
+@with_session(readonly=True)
 def handle_show(commit_id: str, session=None) -> None:
-    """Show full commit context."""
-    try:
-        cid = UUID(commit_id)
-    except ValueError:
+    """Show full commit context (by full UUID or short ID prefix)."""
+    commit_service = get_services(session).commit
+    match = COMMIT_ID_RE.fullmatch(commit_id)
+    if match is None:
         print_error(f"Invalid commit ID: {commit_id}")
         raise ValueError("Invalid UUID")
 
-    commit_service = CommitService(session)
-    commit = commit_service.get_commit(cid)
+    if match.lastgroup == "full":
+        # Already validated, so skip UUID()'s string parsing
+        commit = commit_service.get_commit(UUID(int=int(commit_id.replace("-", ""), 16)))
+    else:
+        commit = commit_service.get_commit_by_prefix(commit_id)
+
     if not commit:
         print_error(f"Commit not found: {commit_id}")
         raise ValueError("Commit not found")
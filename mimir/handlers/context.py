@@ -1,39 +1,34 @@
 from __future__ import annotations
 
-from typing import Optional
+from typing import Iterable, Optional
 
 from mimir.output import print_context_concatenated, print_switched, print_dim
-from mimir.services.commit_service import CommitService
-from mimir.services.task_service import TaskService
 from mimir.state_manager import StateManager
 
-from ._common import with_session, resolve_task_name, require_task_name
+from ._common import get_services, with_session, resolve_task_name, require_task_name
 
 
-@with_session
+@with_session(readonly=True)
 def handle_context(task: Optional[str], branch: Optional[str], reverse: bool, session=None) -> None:
     """Show full context for task."""
     task_name = resolve_task_name(task)
     require_task_name(task_name)
 
-    task_service = TaskService(session)
-    task_obj = task_service.get_task_by_name(task_name)
-    if not task_obj:
+    services = get_services(session)
+    task_id = services.task.get_task_id_by_name(task_name)
+    if not task_id:
         from mimir.output import print_error
 
         print_error(f"Task '{task_name}' not found")
         raise ValueError("Task not found")
 
-    commit_service = CommitService(session)
-
-    commits: list
+    # Ordering is pushed into the query so rows stream straight to output.
+    # Branch history is newest first by default; task commits are oldest first.
+    commits: Iterable
     if branch:
-        commits = commit_service.get_history(task_obj.id, branch, limit=1000)
+        commits = services.commit.iter_history(task_id, branch, newest_first=not reverse)
     else:
-        commits = commit_service.get_commits_for_task(task_obj.id)
-
-    if reverse:
-        commits = list(reversed(commits))
+        commits = services.commit.iter_commits_for_task(task_id, newest_first=reverse)
 
     print_context_concatenated(commits)
 
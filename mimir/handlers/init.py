@@ -1,6 +1,6 @@
 """DB initialization handler."""
 from mimir.output import print_success, print_db_initialized
-from mimir.db import db_manager
+from mimir.db import get_db_manager
 
 
 def handle_init(database_url: str | None = None) -> None:
@@ -9,5 +9,5 @@ def handle_init(database_url: str | None = None) -> None:
 
     url = database_url or settings.database_url
     print_success(f"Initializing database: {url}")
-    db_manager.init_db(url)
+    get_db_manager().init_db(url)
     print_db_initialized()
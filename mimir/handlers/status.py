@@ -4,6 +4,5 @@ from mimir.state_manager import StateManager
 
 def handle_status() -> None:
     """Show current status."""
-    current_task = StateManager.get_current_task()
-    current_branch = StateManager.get_current_branch()
+    current_task, current_branch = StateManager.get_state()
     print_status(current_task, current_branch)
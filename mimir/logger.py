@@ -1,23 +1,25 @@
-"""Centralized logger setup to decouple logging from handlers."""
-import logging
-
-from mimir.config import settings
+"""Centralized logger setup to decouple logging from handlers.
 
+Logging is configured in one place, `mimir.config.setup_logging`; this
+module only hands out loggers on top of it.
 
-def setup_logger(name: str | None = None) -> logging.Logger:
-    level = getattr(logging, settings.log_level.upper(), logging.INFO)
-    formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+Pass log arguments %-style (`logger.info("Created %s", name)`), not as
+f-strings: the message is then only formatted when a handler emits it.
+"""
+import logging
+from typing import Any
 
-    handler = logging.StreamHandler()
-    handler.setFormatter(formatter)
+from mimir.config import get_settings, setup_logging
 
-    logger = logging.getLogger(name or settings.app_name)
-    logger.setLevel(level)
-    # avoid duplicate handlers if already configured
-    if not logger.handlers:
-        logger.addHandler(handler)
 
-    return logger
+def setup_logger(name: str | None = None) -> logging.Logger:
+    """Configure logging (once) and return the named or application logger."""
+    setup_logging()
+    return logging.getLogger(name or get_settings().app_name)
 
 
-logger = setup_logger()
+def __getattr__(name: str) -> Any:
+    # `logger` is resolved on first access (PEP 562)
+    if name == "logger":
+        return setup_logger()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
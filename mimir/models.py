@@ -4,7 +4,9 @@ from typing import Optional
 from uuid import UUID, uuid4
 
 from sqlalchemy import (
+    DateTime,
     ForeignKey,
+    Index,
     SmallInteger,
     String,
     Text,
@@ -12,7 +14,31 @@ from sqlalchemy import (
     create_engine,
     event,
 )
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship, Session
+from sqlalchemy.sql.expression import FunctionElement
+
+
+class clock_timestamp(FunctionElement):
+    """Server-side default for created_at: the time the row is written.
+
+    Postgres `now()` is the transaction start, so every row written in one
+    transaction would share it; `clock_timestamp()` advances per row. Other
+    backends get CURRENT_TIMESTAMP.
+    """
+
+    type = DateTime(timezone=True)
+    inherit_cache = True
+
+
+@compiles(clock_timestamp)
+def _compile_clock_timestamp(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(clock_timestamp, "postgresql")
+def _compile_clock_timestamp_postgresql(element, compiler, **kw):
+    return "clock_timestamp()"
 
 
 class Base(DeclarativeBase):
@@ -31,7 +57,9 @@ class Project(Base):
     parent_id: Mapped[Optional[UUID]] = mapped_column(
         ForeignKey("projects.id"), nullable=True
     )
-    created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=clock_timestamp(), nullable=False
+    )
 
     # Relationships - self-referential for hierarchy
     projects: Mapped[list["Project"]] = relationship(
@@ -61,10 +89,17 @@ class Task(Base):
     project_id: Mapped[UUID] = mapped_column(ForeignKey("projects.id"), nullable=False)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     external_id: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
-    created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=clock_timestamp(), nullable=False
+    )
 
-    # Unique constraint: task name is unique within a project
-    __table_args__ = (UniqueConstraint("project_id", "name", name="uq_project_task_name"),)
+    # Unique constraint: task name is unique within a project. Tasks are also
+    # looked up by name alone (across projects), which the composite unique
+    # index cannot serve
+    __table_args__ = (
+        UniqueConstraint("project_id", "name", name="uq_project_task_name"),
+        Index("ix_tasks_name", "name"),
+    )
 
     # Relationships
     project: Mapped[Project] = relationship("Project", back_populates="tasks")
@@ -83,15 +118,21 @@ class ContextCommit(Base):
     """Context commit model (immutable snapshot)."""
 
     __tablename__ = "context_commits"
+    # Serves per-task listings ordered by time (either direction)
+    __table_args__ = (Index("ix_context_commits_task_created", "task_id", "created_at"),)
 
     id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4)
     task_id: Mapped[UUID] = mapped_column(ForeignKey("tasks.id"), nullable=False)
     message: Mapped[str] = mapped_column(String(512), nullable=False)
-    full_context: Mapped[str] = mapped_column(Text, nullable=False)
+    # Deferred: listings never show it and it can be large; it loads on first
+    # access (or up front via `undefer`)
+    full_context: Mapped[str] = mapped_column(Text, nullable=False, deferred=True)
     author: Mapped[str] = mapped_column(String(255), nullable=False)
     cognitive_load: Mapped[Optional[int]] = mapped_column(SmallInteger, nullable=True)
     uncertainty: Mapped[Optional[int]] = mapped_column(SmallInteger, nullable=True)
-    created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=clock_timestamp(), nullable=False
+    )
 
     # Relationships
     task: Mapped[Task] = relationship("Task", back_populates="commits")
@@ -115,9 +156,6 @@ class CommitParent(Base):
     """Commit parent relationship (supports merge)."""
 
     __tablename__ = "commit_parents"
-    __table_args__ = (
-        UniqueConstraint("child_id", "parent_id", name="uq_commit_parent"),
-    )
 
     child_id: Mapped[UUID] = mapped_column(ForeignKey("context_commits.id"), primary_key=True)
     parent_id: Mapped[UUID] = mapped_column(ForeignKey("context_commits.id"), primary_key=True)
@@ -138,7 +176,9 @@ class Branch(Base):
     head_commit_id: Mapped[Optional[UUID]] = mapped_column(
         ForeignKey("context_commits.id"), nullable=True
     )
-    created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=clock_timestamp(), nullable=False
+    )
 
     # Relationships
     task: Mapped[Task] = relationship("Task", back_populates="branches")
@@ -153,4 +193,7 @@ class Branch(Base):
 def init_db(database_url: str) -> None:
     """Initialize database schema."""
     engine = create_engine(database_url, echo=False)
-    Base.metadata.create_all(engine)
+    try:
+        Base.metadata.create_all(engine)
+    finally:
+        engine.dispose()
@@ -1,37 +1,87 @@
 """Output formatting and display utilities."""
-from datetime import datetime
-from uuid import UUID
+from __future__ import annotations
 
-from rich.console import Console
-from rich.table import Table
+import functools
+import sys
+from typing import TYPE_CHECKING, Iterable
 
-from mimir.models import Branch, ContextCommit, Task
+if TYPE_CHECKING:
+    from rich.console import Console
+    from rich.style import Style
+    from sqlalchemy import Row
 
-console = Console()
+    from mimir.models import Branch, ContextCommit, Task
+    from mimir.services.commit_service import MetricsSummary
 
 
+# (header, style, width) for each history column, in display order. Columns
+# whose cells never outgrow the header get a fixed width, so Rich takes it
+# as-is instead of measuring every cell of the column
+HISTORY_COLUMNS = (
+    ("Commit ID", "cyan", 9),
+    ("Message", "white", None),
+    ("Author", "green", None),
+    ("Created At", "dim", None),
+    ("Load/Unc", "yellow", 8),
+)
+
+
+@functools.lru_cache(maxsize=1)
+def get_console() -> Console:
+    """Return the shared Rich console, importing Rich on first use."""
+    from rich.console import Console
+
+    return Console(highlight=False, soft_wrap=True)
+
+
+@functools.lru_cache(maxsize=1)
+def get_label_style() -> Style:
+    """Return the style of field labels (e.g. "Commit:"), built once."""
+    from rich.style import Style
+
+    return Style(color="cyan", bold=True)
+
+
+def _print_field(console: Console, label: str, value: object) -> None:
+    """Print a styled label and a plain value, with no markup parsing.
+
+    Values such as commit messages may contain brackets, which markup would
+    misread as tags.
+    """
+    from rich.text import Text
+
+    console.print(Text.assemble((label, get_label_style()), f" {value}"))
+
+
+# Single-line messages are written with plain print(): they need no markup
+# parsing, and Rich is kept for tables and multi-part layouts.
 def print_success(message: str) -> None:
     """Print success message."""
-    console.print(f"[bold green]✓ {message}[/bold green]")
+    print(f"✓ {message}")
 
 
 def print_error(message: str) -> None:
-    """Print error message."""
-    console.print(f"[bold red]✗ {message}[/bold red]")
+    """Print error message to stderr."""
+    print(f"✗ {message}", file=sys.stderr)
 
 
 def print_info(message: str) -> None:
     """Print info message."""
-    console.print(f"[bold yellow]ⓘ {message}[/bold yellow]")
+    print(f"ⓘ {message}")
 
 
 def print_dim(message: str) -> None:
-    """Print dim message."""
-    console.print(f"[dim]{message}[/dim]")
+    """Print secondary (detail) message."""
+    print(message)
 
 
+@functools.lru_cache(maxsize=256)
 def format_load_uncertainty(load: int | None, unc: int | None) -> str:
-    """Format cognitive load and uncertainty metrics."""
+    """Format cognitive load and uncertainty metrics.
+
+    Both metrics are small integers (0-10), so the few distinct pairs are
+    formatted once and then served from the cache.
+    """
     if load is None and unc is None:
         return "—"
     load_str = str(load) if load is not None else "—"
@@ -84,92 +134,142 @@ def print_branches_list(branches: list[Branch], task_name: str) -> None:
         print_dim("No branches found")
         return
 
+    from rich.table import Table
+
     table = Table(title=f"Branches for {task_name}")
     table.add_column("Name", style="cyan")
     table.add_column("Head Commit", style="green")
     table.add_column("Created At", style="dim")
 
     for br in branches:
-        commit_id = str(br.head_commit_id)[:8] if br.head_commit_id else "—"
-        created = br.created_at.isoformat()[:19]
+        commit_id = br.head_commit_id.hex[:8] if br.head_commit_id else "—"
+        created = br.created_at.isoformat(timespec="seconds")
         table.add_row(br.name, commit_id, created)
 
-    console.print(table)
+    get_console().print(table)
 
 
-def print_history_table(commits: list[ContextCommit]) -> None:
-    """Print commit history as table."""
+def print_history_table(commits: list[ContextCommit] | list[Row]) -> None:
+    """Print commit history as table.
+
+    Accepts ORM commits or the column-only rows from `get_history_rows`.
+    """
     if not commits:
         print_dim("No commits found")
         return
 
-    table = Table(title="Commit History")
-    table.add_column("Commit ID", style="cyan")
-    table.add_column("Message", style="white")
-    table.add_column("Author", style="green")
-    table.add_column("Created At", style="dim")
-    table.add_column("Load/Unc", style="yellow")
+    from rich import box
+    from rich.table import Table
 
+    # SIMPLE keeps the header rule but skips per-cell box drawing
+    table = Table(title="Commit History", box=box.SIMPLE, show_lines=False)
+    for header, style, width in HISTORY_COLUMNS:
+        table.add_column(header, style=style, width=width)
+
+    # Bound once: this loop runs per commit and can cover thousands of rows
+    add_row = table.add_row
+    fmt_metrics = format_load_uncertainty
     for c in commits:
-        commit_id = str(c.id)[:8]
-        message = c.message[:40]
-        author = c.author
-        created = c.created_at.isoformat()[:19]
-        load_unc = format_load_uncertainty(c.cognitive_load, c.uncertainty)
-        table.add_row(commit_id, message, author, created, load_unc)
+        load, unc = c.cognitive_load, c.uncertainty
+        add_row(
+            c.id.hex[:8],
+            c.message[:40],
+            c.author,
+            c.created_at.isoformat(timespec="seconds"),
+            # Most commits carry no metrics; skip the call for them
+            "—" if load is None and unc is None else fmt_metrics(load, unc),
+        )
+
+    get_console().print(table)
+
+
+def _format_mean(avg: float | None, stddev: float | None) -> str:
+    """Format a mean and its standard deviation, or a dash without data."""
+    if avg is None:
+        return "—"
+    return f"{avg:.1f} ± {stddev or 0:.1f}"
 
-    console.print(table)
+
+def print_history_summary(summary: MetricsSummary) -> None:
+    """Print task-wide metric averages (see `CommitService.get_metrics_summary`)."""
+    print_dim(
+        f"Task metrics over {summary.commits} commits: "
+        f"load {_format_mean(summary.load_avg, summary.load_stddev)}, "
+        f"uncertainty {_format_mean(summary.unc_avg, summary.unc_stddev)}"
+    )
 
 
 def print_commit_details(commit: ContextCommit) -> None:
-    """Print full commit details."""
-    console.print(f"[bold cyan]Commit:[/bold cyan] {commit.id}")
-    console.print(f"[bold cyan]Message:[/bold cyan] {commit.message}")
-    console.print(f"[bold cyan]Author:[/bold cyan] {commit.author}")
-    console.print(f"[bold cyan]Created:[/bold cyan] {commit.created_at.isoformat()}")
-    
-    if commit.cognitive_load is not None:
-        console.print(f"[bold cyan]Cognitive Load:[/bold cyan] {commit.cognitive_load}")
-    if commit.uncertainty is not None:
-        console.print(f"[bold cyan]Uncertainty:[/bold cyan] {commit.uncertainty}")
+    """Print full commit details.
 
-    console.print("\n[bold cyan]Context:[/bold cyan]")
-    console.print(commit.full_context)
+    The header is rendered in one capture and written together with the
+    context, which is plain text and is not run through Rich.
+    """
+    from rich.text import Text
 
+    console = get_console()
+    with console.capture() as capture:
+        _print_field(console, "Commit:", commit.id)
+        _print_field(console, "Message:", commit.message)
+        _print_field(console, "Author:", commit.author)
+        _print_field(console, "Created:", commit.created_at.isoformat())
 
-def print_context_concatenated(commits: list[ContextCommit]) -> None:
-    """Print concatenated contexts with headers."""
-    if not commits:
-        print_dim("No commits found")
-        return
+        if commit.cognitive_load is not None:
+            _print_field(console, "Cognitive Load:", commit.cognitive_load)
+        if commit.uncertainty is not None:
+            _print_field(console, "Uncertainty:", commit.uncertainty)
+
+        console.print()
+        console.print(Text("Context:", style=get_label_style()))
+
+    write = sys.stdout.write
+    write(capture.get())
+    write(commit.full_context)
+    write("\n")
+
+
+def print_context_concatenated(commits: Iterable[ContextCommit] | Iterable[Row]) -> None:
+    """Print concatenated contexts with headers.
+
+    Accepts ORM commits or rows carrying the same column names.
+
+    Commits are printed as they are iterated, so a reversed or streamed
+    iterable is never materialized into a list. Each commit's header is
+    rendered in one capture and written at once; context bodies are written
+    straight to the buffered stdout: they can be large and are plain text,
+    so Rich would only spend time parsing markup out of them.
+    """
+    from rich.text import Text
 
+    console = get_console()
+    write = sys.stdout.write
+    printed = False
     for c in commits:
-        commit_id = str(c.id)[:8]
-        console.rule(f"Commit {commit_id} — {c.message}")
-        console.print(f"Author: {c.author}  Created: {c.created_at.isoformat()}")
-        
+        printed = True
+        header = [f"Author: {c.author}  Created: {c.created_at.isoformat()}"]
         load_unc = format_load_uncertainty(c.cognitive_load, c.uncertainty)
         if load_unc != "—":
-            console.print(f"Metrics: {load_unc}")
-        
-        console.print()
-        console.print(c.full_context)
-        console.print()
+            header.append(f"Metrics: {load_unc}")
+
+        # Header lines are joined into one plain-text render (markup=False
+        # skips the markup parser)
+        with console.capture() as capture:
+            console.rule(Text(f"Commit {c.id.hex[:8]} — {c.message}"))
+            console.print("\n".join(header), markup=False)
+
+        write(capture.get() + "\n")
+        write(c.full_context)
+        write("\n\n")
+
+    if not printed:
+        print_dim("No commits found")
 
 
 def print_status(current_task: str | None, current_branch: str | None) -> None:
     """Print current status."""
-    console.print("[bold]Status:[/bold]")
-    
-    if current_task:
-        console.print(f"  [dim]Task:[/dim] {current_task}")
-    else:
-        console.print(f"  [dim]Task:[/dim] [yellow](not set)[/yellow]")
-
-    if current_branch:
-        console.print(f"  [dim]Branch:[/dim] {current_branch}")
-    else:
-        console.print(f"  [dim]Branch:[/dim] [yellow](not set)[/yellow]")
+    print("Status:")
+    print(f"  Task: {current_task or '(not set)'}")
+    print(f"  Branch: {current_branch or '(not set)'}")
 
 
 def print_db_initialized() -> None:
@@ -179,12 +279,9 @@ def print_db_initialized() -> None:
 
 def print_version() -> None:
     """Print application version."""
-    try:
-        from mimir import __version__
+    from mimir import __version__
 
-        console.print(f"[bold cyan]mimir {__version__}[/bold cyan]")
-    except Exception:
-        console.print("[bold cyan]mimir (unknown version)[/bold cyan]")
+    sys.stdout.write(f"mimir {__version__}\n")
 
 
 def print_tasks_list(tasks_info: list[dict], project_name: str | None = None) -> None:
@@ -198,6 +295,8 @@ def print_tasks_list(tasks_info: list[dict], project_name: str | None = None) ->
         return
 
     title = f"Tasks (Project: {project_name})" if project_name else "Tasks"
+    from rich.table import Table
+
     table = Table(title=title)
     table.add_column("Name", style="cyan")
     
@@ -211,8 +310,8 @@ def print_tasks_list(tasks_info: list[dict], project_name: str | None = None) ->
     table.add_column("Last Commit", style="dim")
 
     for t in tasks_info:
-        created = t["created_at"].isoformat()[:19]
-        last = t["last_commit_at"].isoformat()[:19] if t["last_commit_at"] else "—"
+        created = t["created_at"].isoformat(timespec="seconds")
+        last = t["last_commit_at"].isoformat(timespec="seconds") if t["last_commit_at"] else "—"
         ext = t.get("external_id") or "—"
         
         if project_name:
@@ -220,7 +319,7 @@ def print_tasks_list(tasks_info: list[dict], project_name: str | None = None) ->
         else:
             table.add_row(t["name"], t.get("project", "—"), ext, created, str(t["commits_count"]), last)
 
-    console.print(table)
+    get_console().print(table)
 
 
 def print_project_created(name: str, parent: str | None = None) -> None:
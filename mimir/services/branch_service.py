@@ -1,21 +1,34 @@
 """Branch service for managing branches."""
 import logging
-from uuid import UUID
+from uuid import UUID, uuid4
 
-from sqlalchemy import and_
-from sqlalchemy.orm import Session
+from sqlalchemy import bindparam, select
+from sqlalchemy.orm import Session, raiseload, selectinload
 
-from mimir.models import Branch, Task
+from mimir.db import insert_ignoring_conflicts
+from mimir.models import Branch, ContextCommit, Task
 
 logger = logging.getLogger(__name__)
 
+# Built once at import; per call only the parameters change
+_STMT_BRANCH_BY_TASK_NAME = (
+    select(Branch)
+    .where(Branch.task_id == bindparam("task_id"), Branch.name == bindparam("name"))
+    .limit(1)
+)
+
 
 class BranchService:
     """Service for branch management."""
 
     def __init__(self, session: Session):
-        """Initialize branch service."""
+        """Initialize branch service.
+
+        Branches found by `get_branch` are cached per (task_id, name) for the
+        lifetime of this instance, i.e. of its session.
+        """
         self.session = session
+        self._branch_cache: dict[tuple[UUID, str], Branch] = {}
 
     def create_branch(self, task_id: UUID, name: str, from_commit_id: UUID | None = None) -> Branch:
         """Create a new branch.
@@ -31,36 +44,55 @@ class BranchService:
         Raises:
             ValueError: If task not found or branch already exists
         """
-        # Check if task exists
-        task = self.session.query(Task).filter(Task.id == task_id).first()
+        # Check if task exists (identity-map hit when the caller loaded it)
+        task = self.session.get(Task, task_id)
         if not task:
-            logger.error(f"Task {task_id} not found")
+            logger.error("Task %s not found", task_id)
             raise ValueError(f"Task {task_id} not found")
 
-        # Check if branch already exists
-        existing = self.session.query(Branch).filter(
-            and_(Branch.task_id == task_id, Branch.name == name)
-        ).first()
-        if existing:
-            logger.error(f"Branch '{name}' already exists for task {task_id}")
+        # Create branch; an existing name inserts nothing and returns no row
+        branch = self.session.scalar(
+            insert_ignoring_conflicts(self.session, Branch)
+            .values(id=uuid4(), task_id=task_id, name=name, head_commit_id=from_commit_id)
+            .returning(Branch)
+        )
+        if branch is None:
+            logger.error("Branch '%s' already exists for task %s", name, task_id)
             raise ValueError(f"Branch '{name}' already exists")
 
-        # Create branch
-        branch = Branch(task_id=task_id, name=name, head_commit_id=from_commit_id)
-        self.session.add(branch)
-
-        logger.info(f"Created branch '{name}' for task {task_id}")
+        logger.info("Created branch '%s' for task %s", name, task_id)
         return branch
 
     def get_branch(self, task_id: UUID, name: str) -> Branch | None:
         """Get branch by name."""
-        return self.session.query(Branch).filter(
-            and_(Branch.task_id == task_id, Branch.name == name)
-        ).first()
+        key = (task_id, name)
+        branch = self._branch_cache.get(key)
+        if branch is None:
+            branch = self.session.scalars(
+                _STMT_BRANCH_BY_TASK_NAME, {"task_id": task_id, "name": name}
+            ).first()
+            if branch is not None:
+                self._branch_cache[key] = branch
+        return branch
 
     def list_branches(self, task_id: UUID) -> list[Branch]:
-        """List all branches for a task."""
-        return self.session.query(Branch).filter(Branch.task_id == task_id).all()
+        """List all branches for a task.
+
+        Each branch's `head_commit` is loaded by one extra IN query for the
+        whole list, with only its summary columns (never `full_context`).
+        Any other relationship raises on access instead of lazy-loading.
+        """
+        return (
+            self.session.query(Branch)
+            .options(
+                selectinload(Branch.head_commit).load_only(
+                    ContextCommit.id, ContextCommit.message, ContextCommit.created_at
+                ),
+                raiseload("*"),
+            )
+            .filter(Branch.task_id == task_id)
+            .all()
+        )
 
     def delete_branch(self, task_id: UUID, name: str) -> bool:
         """Delete a branch.
@@ -74,7 +106,7 @@ class BranchService:
         """
         branch = self.get_branch(task_id, name)
         if not branch:
-            logger.error(f"Branch '{name}' not found for task {task_id}")
+            logger.error("Branch '%s' not found for task %s", name, task_id)
             return False
 
         if name == "main":
@@ -82,7 +114,8 @@ class BranchService:
             raise ValueError("Cannot delete main branch")
 
         self.session.delete(branch)
-        logger.info(f"Deleted branch '{name}' from task {task_id}")
+        self._branch_cache.pop((task_id, name), None)
+        logger.info("Deleted branch '%s' from task %s", name, task_id)
         return True
 
     def rename_branch(self, task_id: UUID, old_name: str, new_name: str) -> Branch | None:
@@ -98,15 +131,16 @@ class BranchService:
         """
         branch = self.get_branch(task_id, old_name)
         if not branch:
-            logger.error(f"Branch '{old_name}' not found")
+            logger.error("Branch '%s' not found", old_name)
             return None
 
         # Check if new name already exists
         existing = self.get_branch(task_id, new_name)
         if existing:
-            logger.error(f"Branch '{new_name}' already exists")
+            logger.error("Branch '%s' already exists", new_name)
             raise ValueError(f"Branch '{new_name}' already exists")
 
         branch.name = new_name
-        logger.info(f"Renamed branch '{old_name}' to '{new_name}'")
+        self._branch_cache.pop((task_id, old_name), None)
+        logger.info("Renamed branch '%s' to '%s'", old_name, new_name)
         return branch
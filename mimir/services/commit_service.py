@@ -1,14 +1,153 @@
 """Commit service for managing context commits."""
 import logging
-from uuid import UUID
+import math
+from typing import Iterator, NamedTuple
+from uuid import UUID, uuid4
 
-from sqlalchemy import and_, select, text
-from sqlalchemy.orm import Session
+from sqlalchemy import (
+    DateTime,
+    Row,
+    TextualSelect,
+    Uuid,
+    and_,
+    bindparam,
+    exists,
+    func,
+    select,
+    text,
+)
+from sqlalchemy.orm import Session, raiseload, undefer
 
 from mimir.models import Branch, ContextCommit, CommitParent, Task
 
 logger = logging.getLogger(__name__)
 
+# Rows fetched per round trip when streaming commits
+STREAM_BATCH_SIZE = 50
+
+# Deepest commit the full-history walk reaches. UNION only merges paths that
+# arrive at a commit at the same depth; after a merge of branches with
+# different lengths the walk would otherwise keep producing rows for commits
+# it has already seen, all the way to the root
+MAX_HISTORY_DEPTH = 10_000
+
+# Built once at import; per call only the parameters change
+_STMT_BRANCH_HEAD = (
+    select(Branch.head_commit_id)
+    .where(Branch.task_id == bindparam("task_id"), Branch.name == bindparam("name"))
+    .limit(1)
+)
+
+_STMT_BRANCH = (
+    select(Branch)
+    .where(Branch.task_id == bindparam("task_id"), Branch.name == bindparam("name"))
+    .limit(1)
+)
+
+# Walks commit_parents from :head_commit_id; depth 1 is the head, so ordering
+# by depth ASC yields newest first. Commits at the same depth (the sides of a
+# merge) sort by time and then id, so equal timestamps still order the same
+# way every run. The recursion carries only ids and depths (never the context
+# text); commit columns are joined in once at the end.
+# UNION (not UNION ALL) collapses merge paths that reach a commit at the same
+# depth, so diamonds do not multiply the working set; `visited` then keeps
+# each commit once, at its shortest depth.
+_HISTORY_WALK_SQL = """
+    WITH RECURSIVE commit_history AS (
+        -- Base case: start from branch head
+        SELECT cc.id, 1 AS depth
+        FROM context_commits cc
+        WHERE cc.id = :head_commit_id
+
+        UNION
+
+        -- Recursive case: find parents
+        SELECT cp.parent_id, ch.depth + 1
+        FROM commit_parents cp
+        JOIN commit_history ch ON cp.child_id = ch.id
+        {depth_filter}
+    ),
+    visited AS (
+        SELECT id, MIN(depth) AS depth FROM commit_history GROUP BY id
+    )
+"""
+
+_FULL_HISTORY_SQL = _HISTORY_WALK_SQL + """
+    SELECT
+        cc.id,
+        cc.task_id,
+        cc.message,
+        cc.full_context,
+        cc.author,
+        cc.cognitive_load,
+        cc.uncertainty,
+        cc.created_at,
+        ch.depth
+    FROM visited ch
+    JOIN context_commits cc ON cc.id = ch.id
+    ORDER BY ch.depth {order}, cc.created_at DESC, cc.id
+"""
+
+# The columns of the history table: at most :limit commits, which are never
+# deeper than :limit either
+_HISTORY_ROWS_SQL = _HISTORY_WALK_SQL.format(depth_filter="WHERE ch.depth < :limit") + """
+    SELECT cc.id, cc.message, cc.author, cc.cognitive_load, cc.uncertainty, cc.created_at, ch.depth
+    FROM visited ch
+    JOIN context_commits cc ON cc.id = ch.id
+    ORDER BY ch.depth, cc.created_at DESC, cc.id
+    LIMIT :limit
+"""
+
+
+def _history_stmt(sql: str, *uuid_columns: str) -> TextualSelect:
+    """Return a history query as text() with typed parameters and results.
+
+    The start commit is bound as a UUID, and `uuid_columns` and created_at
+    get result types: Postgres drivers then return UUID and datetime values
+    as they decode them, and on SQLite SQLAlchemy's result processors do the
+    conversion, so rows need no parsing here.
+    """
+    return (
+        text(sql)
+        .bindparams(bindparam("head_commit_id", type_=Uuid))
+        .columns(created_at=DateTime(timezone=True), **{c: Uuid for c in uuid_columns})
+    )
+
+
+_STMT_HISTORY = _history_stmt(
+    _FULL_HISTORY_SQL.format(depth_filter="WHERE ch.depth < :limit", order="ASC"), "id", "task_id"
+)
+_STMT_HISTORY_ALL = {
+    newest_first: _history_stmt(
+        _FULL_HISTORY_SQL.format(
+            depth_filter="WHERE ch.depth < :limit", order="ASC" if newest_first else "DESC"
+        ),
+        "id",
+        "task_id",
+    ).execution_options(yield_per=STREAM_BATCH_SIZE)
+    for newest_first in (True, False)
+}
+_STMT_HISTORY_ROWS = _history_stmt(_HISTORY_ROWS_SQL, "id")
+
+
+class MetricsSummary(NamedTuple):
+    """Task-wide metric averages, see `CommitService.get_metrics_summary`."""
+
+    commits: int
+    load_avg: float | None
+    load_stddev: float | None
+    unc_avg: float | None
+    unc_stddev: float | None
+
+
+def _mean_and_stddev(avg, sq_avg) -> tuple[float | None, float | None]:
+    """Return the mean and population standard deviation from AVG(x) and AVG(x*x)."""
+    if avg is None:
+        return None, None
+    avg = float(avg)
+    # Rounding can leave a tiny negative variance for constant values
+    return avg, math.sqrt(max(float(sq_avg) - avg * avg, 0.0))
+
 
 class CommitService:
     """Service for commit management."""
@@ -44,22 +183,21 @@ class CommitService:
         Raises:
             ValueError: If branch or task not found
         """
-        # Get task
-        task = self.session.query(Task).filter(Task.id == task_id).first()
-        if not task:
-            logger.error(f"Task {task_id} not found")
-            raise ValueError(f"Task {task_id} not found")
-
-        # Get branch
-        branch = self.session.query(Branch).filter(
-            and_(Branch.task_id == task_id, Branch.name == branch_name)
+        # A branch only exists for an existing task, so one lookup covers both
+        branch = self.session.scalars(
+            _STMT_BRANCH, {"task_id": task_id, "name": branch_name}
         ).first()
         if not branch:
-            logger.error(f"Branch '{branch_name}' not found for task {task_id}")
+            if self.session.get(Task, task_id) is None:
+                logger.error("Task %s not found", task_id)
+                raise ValueError(f"Task {task_id} not found")
+            logger.error("Branch '%s' not found for task %s", branch_name, task_id)
             raise ValueError(f"Branch '{branch_name}' not found")
 
-        # Create commit
+        # The id is assigned up front rather than by a flush, so the commit,
+        # its parent link and the branch update go out in a single flush
         commit = ContextCommit(
+            id=uuid4(),
             task_id=task_id,
             message=message,
             full_context=context,
@@ -68,7 +206,6 @@ class CommitService:
             uncertainty=uncertainty,
         )
         self.session.add(commit)
-        self.session.flush()
 
         # Link to parent commit if exists
         if branch.head_commit_id:
@@ -77,31 +214,82 @@ class CommitService:
                 parent_id=branch.head_commit_id,
             )
             self.session.add(parent_relationship)
-            logger.info(f"Created commit {commit.id} with parent {branch.head_commit_id}")
+            logger.info("Created commit %s with parent %s", commit.id, branch.head_commit_id)
 
         # Update branch head
         branch.head_commit_id = commit.id
 
         logger.info(
-            f"Created commit {commit.id} on branch '{branch_name}' for task {task_id}"
+            "Created commit %s on branch '%s' for task %s", commit.id, branch_name, task_id
         )
         return commit
 
     def get_commit(self, commit_id: UUID) -> ContextCommit | None:
-        """Get commit by ID."""
-        return self.session.query(ContextCommit).filter(ContextCommit.id == commit_id).first()
+        """Get commit by ID (served from the identity map when already loaded).
+
+        `full_context` is loaded with the row, as callers display it.
+        """
+        return self.session.get(
+            ContextCommit, commit_id, options=[undefer(ContextCommit.full_context)]
+        )
+
+    def get_commit_by_prefix(self, prefix: str) -> ContextCommit | None:
+        """Get commit by a unique ID prefix (e.g. the short ID shown in history).
+
+        UUIDs sort by their hex digits, so the commits sharing a prefix are
+        one contiguous range of the primary key index: the lookup is a short
+        index range scan, with no cast and no separate index.
+
+        Raises:
+            ValueError: If the prefix is not hex or matches more than one commit
+        """
+        prefix = prefix.lower()
+        low = UUID(prefix.ljust(32, "0"))
+        high = UUID(prefix.ljust(32, "f"))
+        matches = (
+            self.session.query(ContextCommit)
+            .filter(ContextCommit.id.between(low, high))
+            .limit(2)
+            .all()
+        )
+        if len(matches) > 1:
+            logger.error("Commit ID prefix '%s' is ambiguous", prefix)
+            raise ValueError(f"Commit ID prefix '{prefix}' is ambiguous")
+        return matches[0] if matches else None
 
     def get_commit_parents(self, commit_id: UUID) -> list[ContextCommit]:
-        """Get parent commits of a commit."""
-        commit = self.get_commit(commit_id)
-        if not commit:
-            return []
+        """Get parent commits of a commit (none if the commit does not exist).
 
+        One joined query; `full_context` stays deferred.
+        """
         return self.session.query(ContextCommit).join(
             CommitParent,
             ContextCommit.id == CommitParent.parent_id,
         ).filter(CommitParent.child_id == commit_id).all()
 
+    def _get_head_commit_id(self, task_id: UUID, branch_name: str) -> UUID | None:
+        """Return the branch head, or None if the branch is missing or empty."""
+        head_commit_id = self.session.scalar(
+            _STMT_BRANCH_HEAD, {"task_id": task_id, "name": branch_name}
+        )
+        if head_commit_id is None:
+            logger.warning("Branch '%s' not found or has no commits", branch_name)
+        return head_commit_id
+
+    @staticmethod
+    def _row_to_commit(row: Row) -> ContextCommit:
+        """Build a detached ContextCommit from a `_FULL_HISTORY_SQL` row."""
+        return ContextCommit(
+            id=row.id,
+            task_id=row.task_id,
+            message=row.message,
+            full_context=row.full_context,
+            author=row.author,
+            cognitive_load=row.cognitive_load,
+            uncertainty=row.uncertainty,
+            created_at=row.created_at,
+        )
+
     def get_history(self, task_id: UUID, branch_name: str, limit: int = 100) -> list[ContextCommit]:
         """Get commit history for a branch using recursive CTE.
         
@@ -113,94 +301,142 @@ class CommitService:
         Returns:
             List of commits in reverse chronological order
         """
-        # Get branch
-        branch = self.session.query(Branch).filter(
-            and_(Branch.task_id == task_id, Branch.name == branch_name)
-        ).first()
-        
-        if not branch or not branch.head_commit_id:
-            logger.warning(f"Branch '{branch_name}' not found or has no commits")
+        head_commit_id = self._get_head_commit_id(task_id, branch_name)
+        if head_commit_id is None:
             return []
 
-        # Use recursive CTE to traverse commit history
-        query = text("""
-            WITH RECURSIVE commit_history AS (
-                -- Base case: start from branch head
-                SELECT 
-                    cc.id,
-                    cc.task_id,
-                    cc.message,
-                    cc.full_context,
-                    cc.author,
-                    cc.cognitive_load,
-                    cc.uncertainty,
-                    cc.created_at,
-                    1 as depth
-                FROM context_commits cc
-                WHERE cc.id = :head_commit_id
-                
-                UNION ALL
-                
-                -- Recursive case: find parents
-                SELECT 
-                    cc.id,
-                    cc.task_id,
-                    cc.message,
-                    cc.full_context,
-                    cc.author,
-                    cc.cognitive_load,
-                    cc.uncertainty,
-                    cc.created_at,
-                    ch.depth + 1
-                FROM context_commits cc
-                JOIN commit_parents cp ON cc.id = cp.parent_id
-                JOIN commit_history ch ON cp.child_id = ch.id
-                WHERE ch.depth < :limit
-            )
-            SELECT * FROM commit_history
-            ORDER BY depth, created_at DESC
-        """)
+        result = self.session.execute(
+            _STMT_HISTORY, {"head_commit_id": head_commit_id, "limit": limit}
+        )
+
+        commits = [self._row_to_commit(row) for row in result]
+        logger.info("Retrieved %s commits from history", len(commits))
+        return commits
+
+    def iter_history(
+        self, task_id: UUID, branch_name: str, newest_first: bool = True
+    ) -> Iterator[Row]:
+        """Stream the full commit history of a branch.
+
+        Unlike `get_history` the walk goes back `MAX_HISTORY_DEPTH` commits;
+        rows are fetched `STREAM_BATCH_SIZE` at a time so memory stays flat
+        however much context the branch holds. Rows are yielded as-is,
+        without building ContextCommit objects.
+
+        Args:
+            task_id: Task ID
+            branch_name: Branch name
+            newest_first: Yield from the branch head back to the root
+                (False walks the same commits root first)
+
+        Yields:
+            Rows with the ContextCommit columns (attribute access by name)
+        """
+        head_commit_id = self._get_head_commit_id(task_id, branch_name)
+        if head_commit_id is None:
+            return
 
         result = self.session.execute(
-            query,
-            {"head_commit_id": str(branch.head_commit_id), "limit": limit},
+            _STMT_HISTORY_ALL[newest_first],
+            {"head_commit_id": head_commit_id, "limit": MAX_HISTORY_DEPTH},
         )
 
-        commits = []
-        for row in result:
-            # row elements may already be UUID objects (depending on DB driver),
-            # or strings. Normalize safely.
-            raw_id = row[0]
-            raw_task_id = row[1]
-
-            commit_id = raw_id if isinstance(raw_id, UUID) else UUID(str(raw_id))
-            task_uuid = raw_task_id if isinstance(raw_task_id, UUID) else UUID(str(raw_task_id))
-
-            commit = ContextCommit(
-                id=commit_id,
-                task_id=task_uuid,
-                message=row[2],
-                full_context=row[3],
-                author=row[4],
-                cognitive_load=row[5],
-                uncertainty=row[6],
-                created_at=row[7],
-            )
-            commits.append(commit)
+        yield from result
 
-        logger.info(f"Retrieved {len(commits)} commits from history")
-        return commits
+    def get_history_rows(self, task_id: UUID, branch_name: str, limit: int = 100) -> list[Row]:
+        """Get commit history for a branch without the context text.
+
+        Same traversal as `get_history`, but only the columns shown in the
+        history table are selected, so `full_context` is never transferred.
+
+        Returns:
+            Rows with id, message, author, cognitive_load, uncertainty,
+            created_at and depth, in reverse chronological order
+        """
+        head_commit_id = self._get_head_commit_id(task_id, branch_name)
+        if head_commit_id is None:
+            return []
+
+        rows = self.session.execute(
+            _STMT_HISTORY_ROWS, {"head_commit_id": head_commit_id, "limit": limit}
+        ).all()
+
+        logger.info("Retrieved %s commits from history", len(rows))
+        return rows
+
+    def get_metrics_summary(self, task_id: UUID) -> MetricsSummary:
+        """Summarize cognitive load and uncertainty over a task's commits.
+
+        Aggregated in the database, so one row comes back however many
+        commits the task has. Standard deviations are derived from AVG(x) and
+        AVG(x*x), which every backend has (SQLite lacks STDDEV_POP).
+
+        Returns:
+            MetricsSummary; a metric's average and deviation are None when no
+            commit records it
+        """
+        load, unc = ContextCommit.cognitive_load, ContextCommit.uncertainty
+        row = self.session.execute(
+            select(
+                func.count(ContextCommit.id),
+                func.avg(load),
+                func.avg(load * load),
+                func.avg(unc),
+                func.avg(unc * unc),
+            ).where(ContextCommit.task_id == task_id)
+        ).one()
+        commits, load_avg, load_sq_avg, unc_avg, unc_sq_avg = row
+        return MetricsSummary(
+            commits,
+            *_mean_and_stddev(load_avg, load_sq_avg),
+            *_mean_and_stddev(unc_avg, unc_sq_avg),
+        )
 
     def get_commits_for_task(self, task_id: UUID) -> list[ContextCommit]:
-        """Return all commits for a task ordered by creation time."""
+        """Return all commits for a task ordered by creation time.
+
+        No relationships are loaded; touching one raises instead of issuing
+        a query per commit.
+        """
         rows = (
             self.session.query(ContextCommit)
+            .options(raiseload("*"))
             .filter(ContextCommit.task_id == task_id)
             .order_by(ContextCommit.created_at.asc())
             .all()
         )
         return rows
 
+    def iter_commits_for_task(
+        self, task_id: UUID, newest_first: bool = False
+    ) -> Iterator[Row]:
+        """Stream all commits for a task ordered by creation time.
+
+        Rows are fetched `STREAM_BATCH_SIZE` at a time instead of loading every
+        commit (and its full context) up front, and only the displayed columns
+        are selected, as plain rows rather than ORM objects. Commits with the
+        same created_at are ordered by id, so the order is the same every time.
+        """
+        if newest_first:
+            order = (ContextCommit.created_at.desc(), ContextCommit.id.desc())
+        else:
+            order = (ContextCommit.created_at.asc(), ContextCommit.id.asc())
+        stmt = (
+            select(
+                ContextCommit.id,
+                ContextCommit.message,
+                ContextCommit.full_context,
+                ContextCommit.author,
+                ContextCommit.cognitive_load,
+                ContextCommit.uncertainty,
+                ContextCommit.created_at,
+            )
+            .where(ContextCommit.task_id == task_id)
+            .order_by(*order)
+            .execution_options(yield_per=STREAM_BATCH_SIZE)
+        )
+        return iter(self.session.execute(stmt))
+
     def merge_commit(
         self,
         task_id: UUID,
@@ -229,31 +465,36 @@ class CommitService:
             and_(Branch.task_id == task_id, Branch.name == target_branch)
         ).first()
         if not branch:
-            logger.error(f"Target branch '{target_branch}' not found")
+            logger.error("Target branch '%s' not found", target_branch)
             raise ValueError(f"Target branch '{target_branch}' not found")
 
         if not branch.head_commit_id:
-            logger.error(f"Target branch '{target_branch}' has no commits")
+            logger.error("Target branch '%s' has no commits", target_branch)
             raise ValueError(f"Target branch '{target_branch}' has no commits")
 
-        # Get source commit
-        source_commit = self.get_commit(source_commit_id)
-        if not source_commit:
-            logger.error(f"Source commit {source_commit_id} not found")
+        # Check source commit (existence only; its context is not needed)
+        source_exists = self.session.scalar(
+            select(exists().where(ContextCommit.id == source_commit_id))
+        )
+        if not source_exists:
+            logger.error("Source commit %s not found", source_commit_id)
             raise ValueError(f"Source commit {source_commit_id} not found")
 
-        # Create merge commit (empty context - could be filled with merged context)
+        # Create merge commit (empty context - could be filled with merged context).
+        # As in create_commit, the id is assigned up front so the commit, both
+        # parent links and the branch update go out in a single flush.
         merge_commit = ContextCommit(
+            id=uuid4(),
             task_id=task_id,
             message=message,
             full_context="",  # In real scenario, would contain merged context
             author=author,
         )
         self.session.add(merge_commit)
-        self.session.flush()
 
         # Add both parents
-        parent1 = CommitParent(child_id=merge_commit.id, parent_id=branch.head_commit_id)
+        previous_head = branch.head_commit_id
+        parent1 = CommitParent(child_id=merge_commit.id, parent_id=previous_head)
         parent2 = CommitParent(child_id=merge_commit.id, parent_id=source_commit_id)
         self.session.add(parent1)
         self.session.add(parent2)
@@ -262,7 +503,9 @@ class CommitService:
         branch.head_commit_id = merge_commit.id
 
         logger.info(
-            f"Created merge commit {merge_commit.id} "
-            f"with parents {branch.head_commit_id} and {source_commit_id}"
+            "Created merge commit %s with parents %s and %s",
+            merge_commit.id,
+            previous_head,
+            source_commit_id,
         )
         return merge_commit
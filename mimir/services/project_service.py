@@ -1,13 +1,26 @@
 """Project service for managing projects."""
 import logging
-from uuid import UUID
+from typing import NamedTuple
+from uuid import UUID, uuid4
 
+from sqlalchemy import Row, bindparam, exists, select
 from sqlalchemy.orm import Session
 
+from mimir.db import insert_ignoring_conflicts, transaction_cache
 from mimir.models import Project
 
 logger = logging.getLogger(__name__)
 
+class ProjectTreeRow(NamedTuple):
+    """A project's place in `ProjectService.tree()`."""
+
+    name: str
+    depth: int
+
+
+# Built once at import; per call only the parameters change
+_STMT_PROJECT_ID_BY_NAME = select(Project.id).where(Project.name == bindparam("name")).limit(1)
+
 
 class ProjectService:
     """Service for project management."""
@@ -29,23 +42,24 @@ class ProjectService:
         Raises:
             ValueError: If project already exists or parent not found
         """
-        # Check if project exists
-        existing = self.session.query(Project).filter(Project.name == name).first()
-        if existing:
-            logger.error(f"Project '{name}' already exists")
-            raise ValueError(f"Project '{name}' already exists")
-
         # Validate parent exists if specified
         if parent_id:
-            parent = self.session.query(Project).filter(Project.id == parent_id).first()
+            parent = self.session.scalar(select(exists().where(Project.id == parent_id)))
             if not parent:
-                logger.error(f"Parent project with id {parent_id} not found")
+                logger.error("Parent project with id %s not found", parent_id)
                 raise ValueError(f"Parent project with id {parent_id} not found")
 
-        # Create project
-        project = Project(name=name, parent_id=parent_id)
-        self.session.add(project)
-        logger.info(f"Created project '{name}' with id {project.id}")
+        # Create project; a taken name inserts nothing and returns no row
+        project = self.session.scalar(
+            insert_ignoring_conflicts(self.session, Project)
+            .values(id=uuid4(), name=name, parent_id=parent_id)
+            .returning(Project)
+        )
+        if project is None:
+            logger.error("Project '%s' already exists", name)
+            raise ValueError(f"Project '{name}' already exists")
+
+        logger.info("Created project '%s' with id %s", name, project.id)
         return project
 
     def get_project(self, project_id: UUID) -> Project | None:
@@ -56,6 +70,18 @@ class ProjectService:
         """Get project by name."""
         return self.session.query(Project).filter(Project.name == name).first()
 
+    def get_project_id_by_name(self, name: str) -> UUID | None:
+        """Get a project's id by name, cached for the session's current transaction."""
+        project_ids = transaction_cache(self.session, "project_ids")
+        project_id = project_ids.get(name)
+        if project_id is None:
+            # Only the id column is selected; no Project is hydrated
+            project_id = self.session.scalar(_STMT_PROJECT_ID_BY_NAME, {"name": name})
+            if project_id is None:
+                return None
+            project_ids[name] = project_id
+        return project_id
+
     def list_projects(self, include_children: bool = True) -> list[Project]:
         """List all projects.
         
@@ -68,6 +94,31 @@ class ProjectService:
         projects = self.session.query(Project).order_by(Project.name).all()
         return projects
 
+    def tree(self) -> list[ProjectTreeRow]:
+        """Return every project in depth-first, name-ordered tree order.
+
+        One query loads the projects' names and parent ids; the tree order is
+        computed here, so it works the same on every database.
+
+        Returns:
+            Rows with name and depth (0 for root projects)
+        """
+        rows = self.session.execute(
+            select(Project.id, Project.name, Project.parent_id).order_by(Project.name)
+        ).all()
+        children: dict[UUID | None, list[Row]] = {}
+        for row in rows:
+            children.setdefault(row.parent_id, []).append(row)
+
+        result: list[ProjectTreeRow] = []
+        # Rows are name-ordered, so pushing each level reversed pops it in order
+        stack = [(row, 0) for row in reversed(children.get(None, []))]
+        while stack:
+            row, depth = stack.pop()
+            result.append(ProjectTreeRow(row.name, depth))
+            stack.extend((child, depth + 1) for child in reversed(children.get(row.id, [])))
+        return result
+
     def list_root_projects(self) -> list[Project]:
         """List only root projects (those without parent)."""
         return (
@@ -97,11 +148,12 @@ class ProjectService:
         """
         project = self.session.query(Project).filter(Project.id == project_id).first()
         if not project:
-            logger.warning(f"Project with id {project_id} not found")
+            logger.warning("Project with id %s not found", project_id)
             return False
 
         self.session.delete(project)
-        logger.info(f"Deleted project '{project.name}' with id {project_id}")
+        transaction_cache(self.session, "project_ids").pop(project.name, None)
+        logger.info("Deleted project '%s' with id %s", project.name, project_id)
         return True
 
     def rename_project(self, project_id: UUID, new_name: str) -> Project | None:
@@ -117,36 +169,21 @@ class ProjectService:
         Raises:
             ValueError: If new name already exists
         """
-        project = self.session.query(Project).filter(Project.id == project_id).first()
+        project = self.session.get(Project, project_id)
         if not project:
-            logger.warning(f"Project with id {project_id} not found")
+            logger.warning("Project with id %s not found", project_id)
             return None
 
         # Check if new name already exists
-        existing = self.session.query(Project).filter(Project.name == new_name).first()
-        if existing and existing.id != project_id:
-            logger.error(f"Project '{new_name}' already exists")
+        existing = self.session.scalar(
+            select(exists().where(Project.name == new_name, Project.id != project_id))
+        )
+        if existing:
+            logger.error("Project '%s' already exists", new_name)
             raise ValueError(f"Project '{new_name}' already exists")
 
         old_name = project.name
         project.name = new_name
-        logger.info(f"Renamed project from '{old_name}' to '{new_name}'")
+        transaction_cache(self.session, "project_ids").pop(old_name, None)
+        logger.info("Renamed project from '%s' to '%s'", old_name, new_name)
         return project
-
-    def get_project_hierarchy(self, project_id: UUID) -> dict:
-        """Get full hierarchy of a project (with children).
-        
-        Returns:
-            Dictionary representing the project tree
-        """
-        project = self.session.query(Project).filter(Project.id == project_id).first()
-        if not project:
-            return {}
-
-        children = self.list_child_projects(project_id)
-        return {
-            "id": str(project.id),
-            "name": project.name,
-            "parent_id": str(project.parent_id) if project.parent_id else None,
-            "children": [self.get_project_hierarchy(child.id) for child in children],
-        }
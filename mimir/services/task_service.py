@@ -1,20 +1,34 @@
 """Task service for managing tasks."""
 import logging
-from uuid import UUID
+from uuid import UUID, uuid4
 
-from sqlalchemy.orm import Session
+from sqlalchemy import Row, bindparam, func, select
+from sqlalchemy.orm import Session, joinedload, raiseload, selectinload
 
-from mimir.models import Branch, Project, Task
+from mimir.db import insert_ignoring_conflicts, transaction_cache
+from mimir.models import Branch, ContextCommit, Project, Task
 
 logger = logging.getLogger(__name__)
 
+# Built once at import; per call only the parameters change
+_STMT_TASK_BY_NAME = select(Task).where(Task.name == bindparam("name")).limit(1)
+_STMT_TASK_ID_BY_NAME = select(Task.id).where(Task.name == bindparam("name")).limit(1)
+_STMT_TASKS = select(Task).options(joinedload(Task.project), raiseload("*"))
+_STMT_TASKS_BY_PROJECT = _STMT_TASKS.where(Task.project_id == bindparam("project_id"))
+
 
 class TaskService:
     """Service for task management."""
 
     def __init__(self, session: Session):
-        """Initialize task service."""
+        """Initialize task service.
+
+        Name lookups are cached on the instance, so the cache lives only as
+        long as the session it was built with and never outlives a
+        transaction boundary that other writers could change.
+        """
         self.session = session
+        self._name_cache: dict[str, Task] = {}
 
     def create_task(self, project_id: UUID, name: str, author: str = "default", external_id: str | None = None) -> Task:
         """Create a new task with main branch.
@@ -31,32 +45,29 @@ class TaskService:
         Raises:
             ValueError: If task already exists or project not found
         """
-        # Validate project exists
-        project = self.session.query(Project).filter(Project.id == project_id).first()
+        # Validate project exists (identity-map hit when the caller loaded it)
+        project = self.session.get(Project, project_id)
         if not project:
-            logger.error(f"Project with id {project_id} not found")
+            logger.error("Project with id %s not found", project_id)
             raise ValueError(f"Project with id {project_id} not found")
 
-        # Check if task already exists in this project
-        existing = (
-            self.session.query(Task)
-            .filter(Task.project_id == project_id, Task.name == name)
-            .first()
+        # Create task; a name taken in this project inserts nothing and
+        # returns no row
+        task = self.session.scalar(
+            insert_ignoring_conflicts(self.session, Task)
+            .values(id=uuid4(), project_id=project_id, name=name, external_id=external_id)
+            .returning(Task)
         )
-        if existing:
-            logger.error(f"Task '{name}' already exists in project '{project.name}'")
+        if task is None:
+            logger.error("Task '%s' already exists in project '%s'", name, project.name)
             raise ValueError(f"Task '{name}' already exists in this project")
 
-        # Create task
-        task = Task(project_id=project_id, name=name, external_id=external_id)
-        self.session.add(task)
-        self.session.flush()  # Get the task ID
-
         # Create main branch
         main_branch = Branch(task_id=task.id, name="main", head_commit_id=None)
         self.session.add(main_branch)
+        self._name_cache.pop(name, None)
 
-        logger.info(f"Created task '{name}' in project '{project.name}' with id {task.id}")
+        logger.info("Created task '%s' in project '%s' with id %s", name, project.name, task.id)
         return task
 
     def get_task(self, task_id: UUID) -> Task | None:
@@ -65,7 +76,44 @@ class TaskService:
 
     def get_task_by_name(self, name: str) -> Task | None:
         """Get task by name (searches all projects)."""
-        return self.session.query(Task).filter(Task.name == name).first()
+        task = self._name_cache.get(name)
+        if task is None:
+            task = self.session.scalars(_STMT_TASK_BY_NAME, {"name": name}).first()
+            if task is not None:
+                self._name_cache[name] = task
+        return task
+
+    def get_task_id_by_name(self, name: str) -> UUID | None:
+        """Get a task's id by name, cached for the session's current transaction.
+
+        For callers that only need the id; repeated lookups of the same name
+        within one transaction skip the query.
+        """
+        task_ids = transaction_cache(self.session, "task_ids")
+        task_id = task_ids.get(name)
+        if task_id is None:
+            # Only the id column is selected; no Task is hydrated
+            task_id = self.session.scalar(_STMT_TASK_ID_BY_NAME, {"name": name})
+            if task_id is None:
+                return None
+            task_ids[name] = task_id
+        return task_id
+
+    def get_task_with_branches(self, name: str) -> Task | None:
+        """Get task by name with its branches loaded in the same call.
+
+        Callers that validate several branches of one task can then resolve
+        them from `task.branches` without a query per branch.
+        """
+        task = (
+            self.session.query(Task)
+            .options(selectinload(Task.branches))
+            .filter(Task.name == name)
+            .first()
+        )
+        if task is not None:
+            self._name_cache[name] = task
+        return task
 
     def get_task_by_name_in_project(self, project_id: UUID, name: str) -> Task | None:
         """Get task by name within a specific project."""
@@ -82,20 +130,53 @@ class TaskService:
             project_id: If provided, list only tasks in this project
             
         Returns:
-            List of tasks
+            List of tasks, each with its project loaded (same query); other
+            relationships raise on access instead of lazy-loading per task
         """
-        query = self.session.query(Task)
         if project_id:
-            query = query.filter(Task.project_id == project_id)
-        return query.all()
+            return self.session.scalars(_STMT_TASKS_BY_PROJECT, {"project_id": project_id}).all()
+        return self.session.scalars(_STMT_TASKS).all()
+
+    def list_tasks_with_commit_stats(self, project_id: UUID | None = None) -> list[Row]:
+        """List tasks with their project name and commit statistics.
+
+        One query: commits are outer-joined and aggregated per task in the
+        database, so neither commit rows nor their contexts are loaded, and
+        with `project_id` only that project's commits are aggregated.
+
+        Args:
+            project_id: If provided, list only tasks in this project
+
+        Returns:
+            Rows with name, external_id, created_at, project_name,
+            commits_count and last_commit_at (None for tasks without commits)
+        """
+        stmt = (
+            select(
+                Task.name,
+                Task.external_id,
+                Task.created_at,
+                Project.name.label("project_name"),
+                func.count(ContextCommit.id).label("commits_count"),
+                func.max(ContextCommit.created_at).label("last_commit_at"),
+            )
+            .join(Project, Task.project_id == Project.id)
+            .outerjoin(ContextCommit, ContextCommit.task_id == Task.id)
+            .group_by(Task.id, Project.id)
+        )
+        if project_id:
+            stmt = stmt.where(Task.project_id == project_id)
+        return self.session.execute(stmt).all()
 
     def delete_task(self, task_id: UUID) -> bool:
         """Delete a task."""
         task = self.get_task(task_id)
         if not task:
-            logger.error(f"Task {task_id} not found")
+            logger.error("Task %s not found", task_id)
             return False
 
         self.session.delete(task)
-        logger.info(f"Deleted task {task_id}")
+        self._name_cache.pop(task.name, None)
+        transaction_cache(self.session, "task_ids").pop(task.name, None)
+        logger.info("Deleted task %s", task_id)
         return True
@@ -1,54 +1,88 @@
 """Local state management for Mimir."""
+import functools
 import json
 import logging
-from pathlib import Path
+import os
 from typing import Any
 
-from mimir.config import STATE_FILE
+from mimir.config import get_state_file
 
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=1)
+def _read_state(path: str, mtime_ns: int, size: int) -> dict[str, Any]:
+    """Parse the state file; keyed on mtime/size so a changed file is re-read."""
+    with open(path, "r") as f:
+        return json.load(f)
+
+
 class StateManager:
-    """Manages local state in ~/.mimir/state.json."""
+    """Manages local state in ~/.mimir/state.json.
+
+    Reads are cached on the file's mtime and size, so repeated lookups within
+    a process only stat the file.
+    """
 
     @staticmethod
     def load() -> dict[str, Any]:
         """Load state from file."""
         try:
-            if STATE_FILE.exists():
-                with open(STATE_FILE, "r") as f:
-                    return json.load(f)
+            state_file = get_state_file()
+            st = state_file.stat()
+            # Copy: callers modify the returned dict before saving it
+            return dict(_read_state(str(state_file), st.st_mtime_ns, st.st_size))
+        except FileNotFoundError:
+            pass
         except Exception as e:
-            logger.error(f"Error loading state: {e}")
+            logger.error("Error loading state: %s", e)
         return {"current_task": None, "current_branch": None}
 
     @staticmethod
     def save(state: dict[str, Any]) -> None:
-        """Save state to file."""
+        """Save state to file.
+
+        Written to a temporary file and renamed over the old one, so a reader
+        never sees a partial file.
+        """
         try:
-            STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
-            with open(STATE_FILE, "w") as f:
-                json.dump(state, f, indent=2)
-            logger.debug(f"State saved to {STATE_FILE}")
+            state_file = get_state_file()
+            state_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = state_file.with_suffix(".tmp")
+            with open(tmp_file, "w") as f:
+                json.dump(state, f, separators=(",", ":"))
+            os.replace(tmp_file, state_file)
+            # Same-size rewrites within the filesystem's timestamp granularity
+            # would otherwise look unchanged
+            _read_state.cache_clear()
+            logger.debug("State saved to %s", state_file)
         except Exception as e:
-            logger.error(f"Error saving state: {e}")
+            logger.error("Error saving state: %s", e)
 
     @staticmethod
-    def set_current_task(task_name: str) -> None:
-        """Set current task."""
+    def _update(key: str, value: str) -> None:
+        """Set one state key and write the file."""
         state = StateManager.load()
-        state["current_task"] = task_name
+        state[key] = value
         StateManager.save(state)
-        logger.info(f"Current task set to: {task_name}")
+
+    @staticmethod
+    def set_current_task(task_name: str) -> None:
+        """Set current task."""
+        StateManager._update("current_task", task_name)
+        logger.info("Current task set to: %s", task_name)
 
     @staticmethod
     def set_current_branch(branch_name: str) -> None:
         """Set current branch."""
+        StateManager._update("current_branch", branch_name)
+        logger.info("Current branch set to: %s", branch_name)
+
+    @staticmethod
+    def get_state() -> tuple[str | None, str | None]:
+        """Get current task and branch from a single read of the state file."""
         state = StateManager.load()
-        state["current_branch"] = branch_name
-        StateManager.save(state)
-        logger.info(f"Current branch set to: {branch_name}")
+        return state.get("current_task"), state.get("current_branch")
 
     @staticmethod
     def get_current_task() -> str | None:
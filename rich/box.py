@@ -0,0 +1 @@
+SIMPLE = None
@@ -1,7 +1,33 @@
+import contextlib
+import io
+
+
+class _Capture:
+    def __init__(self):
+        self._buffer = io.StringIO()
+        self._redirect = contextlib.redirect_stdout(self._buffer)
+
+    def __enter__(self):
+        self._redirect.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        self._redirect.__exit__(*exc)
+
+    def get(self):
+        return self._buffer.getvalue()
+
+
 class Console:
+    def __init__(self, **kwargs):
+        pass
+
     def print(self, *args, **kwargs):
         # simple print to stdout for tests
         print(*args)
 
     def rule(self, title):
         print(f"--- {title} ---")
+
+    def capture(self):
+        return _Capture()
@@ -0,0 +1,3 @@
+class Style:
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
@@ -1,10 +1,10 @@
 class Table:
-    def __init__(self, title=None):
+    def __init__(self, title=None, **kwargs):
         self.title = title
         self.columns = []
         self.rows = []
 
-    def add_column(self, name, style=None):
+    def add_column(self, name, style=None, **kwargs):
         self.columns.append((name, style))
 
     def add_row(self, *cells):
@@ -0,0 +1,7 @@
+class Text(str):
+    def __new__(cls, text="", *args, **kwargs):
+        return super().__new__(cls, text)
+
+    @classmethod
+    def assemble(cls, *parts, **kwargs):
+        return cls("".join(p[0] if isinstance(p, tuple) else p for p in parts))
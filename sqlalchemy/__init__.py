@@ -12,6 +12,9 @@ class _DummyEngine:
 		self.url = url
 
 
+Engine = _DummyEngine
+
+
 def create_engine(url, **kwargs):
 	return _DummyEngine(url, **kwargs)
 
@@ -33,16 +36,29 @@ def String(length=None):
 Text = str
 
 
+def DateTime(timezone=False):
+	return ("DateTime", timezone)
+
+
 class UniqueConstraint:
 	def __init__(self, *args, **kwargs):
 		pass
 
 
+class Index:
+	def __init__(self, *args, **kwargs):
+		pass
+
+
 class _Event:
 	@staticmethod
 	def listen(*args, **kwargs):
 		return None
 
+	@staticmethod
+	def listens_for(*args, **kwargs):
+		return lambda fn: fn
+
 
 event = _Event()
 
@@ -51,9 +67,64 @@ def and_(*conds):
 	return ("AND", conds)
 
 
+class _Select(tuple):
+	"""Chainable stand-in for a Select; generative methods return self."""
+
+	def _chain(self, *args, **kwargs):
+		return self
+
+	where = order_by = limit = options = execution_options = _chain
+	join = outerjoin = group_by = values = returning = _chain
+	bindparams = columns = _chain
+
+
 def select(*args, **kwargs):
-	return ("SELECT", args)
+	return _Select(("SELECT", args))
+
+
+class _Func:
+	def __getattr__(self, name):
+		return lambda *args, **kwargs: ("FUNC", name, args)
+
+
+func = _Func()
+
+
+def insert(*args, **kwargs):
+	return _Select(("INSERT", args))
+
+
+def update(*args, **kwargs):
+	return _Select(("UPDATE", args))
+
+
+def exists(*args, **kwargs):
+	return _Select(("EXISTS", args))
+
+
+def bindparam(key, *args, **kwargs):
+	return ("BINDPARAM", key)
 
 
 def text(s: str):
-	return s
+	return _Select(("TEXT", s))
+
+
+Uuid = str
+TextualSelect = _Select
+
+
+def literal(value, *args, **kwargs):
+	return ("LITERAL", value)
+
+
+def ARRAY(item_type, *args, **kwargs):
+	return ("ARRAY", item_type)
+
+
+def cast(expr, type_):
+	return ("CAST", expr, type_)
+
+
+class Row(tuple):
+	pass
@@ -0,0 +1 @@
+"""Minimal sqlalchemy.ext shim for tests."""
@@ -24,6 +24,11 @@ def sessionmaker(bind=None, class_=None, expire_on_commit=True):
     return factory
 
 
+def scoped_session(session_factory):
+    """Return the factory itself; the shim has no thread-local registry."""
+    return session_factory
+
+
 class DeclarativeBase:
     """Placeholder base class for declarative mappings."""
 
@@ -42,3 +47,30 @@ def mapped_column(*args, **kwargs):
 def relationship(*args, **kwargs):
     """Placeholder for relationship - returns None."""
     return None
+
+
+class _LoaderOption:
+    """Placeholder for a chainable loader option."""
+
+    def load_only(self, *args, **kwargs):
+        return self
+
+
+def joinedload(*args, **kwargs):
+    """Placeholder for joinedload loader option."""
+    return _LoaderOption()
+
+
+def raiseload(*args, **kwargs):
+    """Placeholder for raiseload loader option."""
+    return _LoaderOption()
+
+
+def undefer(*args, **kwargs):
+    """Placeholder for undefer loader option."""
+    return _LoaderOption()
+
+
+def selectinload(*args, **kwargs):
+    """Placeholder for selectinload loader option."""
+    return _LoaderOption()
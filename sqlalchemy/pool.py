@@ -0,0 +1,9 @@
+"""Minimal sqlalchemy.pool shim for tests."""
+
+
+class QueuePool:
+	pass
+
+
+class StaticPool:
+	pass
@@ -0,0 +1 @@
+"""Minimal sqlalchemy.sql shim for tests."""
@@ -0,0 +1,5 @@
+"""Minimal sqlalchemy.sql.expression shim for tests."""
+
+
+class FunctionElement:
+	pass
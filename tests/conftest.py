@@ -1,4 +1,69 @@
+import sqlite3
+from types import SimpleNamespace
+
 import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+import mimir.output as output
+from mimir.db import DatabaseManager
+from mimir.handlers import _common, branch, commit, context, init, project, status, task
+from mimir.models import Base
+from mimir.services.branch_service import BranchService
+from mimir.services.commit_service import CommitService
+from mimir.services.project_service import ProjectService
+from mimir.services.task_service import TaskService
+from mimir.state_manager import StateManager
+
+
+def _connect() -> sqlite3.Connection:
+    """Open the test database.
+
+    Built here rather than from the URL: pysqlite's own BEGIN handling is off
+    (it breaks SAVEPOINTs; the engine emits BEGIN itself), and the single
+    connection may be used from any thread. An in-memory database already
+    journals in memory and never syncs; temp_store keeps sorts and temporary
+    tables off disk as well.
+    """
+    conn = sqlite3.connect(":memory:", check_same_thread=False, isolation_level=None)
+    conn.execute("PRAGMA temp_store=MEMORY")
+    return conn
+
+
+@pytest.fixture(scope="session")
+def engine():
+    """One in-memory SQLite database for the whole run, schema created once.
+
+    StaticPool hands every checkout the same connection, which is what keeps
+    the in-memory database (and its schema) alive between tests.
+    """
+    engine = create_engine("sqlite+pysqlite://", creator=_connect, poolclass=StaticPool)
+
+    # pysqlite no longer emits BEGIN (see _connect)
+    @event.listens_for(engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db_session(engine):
+    """Session in a transaction that is rolled back after the test.
+
+    `session.commit()` in a test only releases a SAVEPOINT, so nothing
+    outlives the test.
+    """
+    conn = engine.connect()
+    trans = conn.begin()
+    session = Session(bind=conn, join_transaction_mode="create_savepoint")
+    yield session
+    session.close()
+    trans.rollback()
+    conn.close()
 
 
 class DummySession:
@@ -20,26 +85,104 @@ def dummy_session():
 
 @pytest.fixture(autouse=True)
 def patch_db_session(monkeypatch, dummy_session):
-    """Patch db_manager.get_session to return a lightweight dummy session."""
-    import mimir.db as db_module
-
-    monkeypatch.setattr(db_module, "get_session", lambda: dummy_session)
+    """Make the database manager hand handlers a lightweight dummy session."""
+    monkeypatch.setattr(DatabaseManager, "get_session", lambda self: dummy_session)
     yield dummy_session
 
 
+def patch_many(monkeypatch, obj, **attrs) -> None:
+    """Set several attributes of `obj` for the test, e.g. stubbed methods."""
+    for name, value in attrs.items():
+        monkeypatch.setattr(obj, name, value)
+
+
+# Service methods stubbed by `stub_services`; names are unique across services
+_STUBBED_METHODS = {
+    TaskService: (
+        "create_task",
+        "get_task_id_by_name",
+        "get_task_with_branches",
+    ),
+    CommitService: (
+        "create_commit",
+        "get_commit",
+        "get_history_rows",
+        "get_metrics_summary",
+        "iter_commits_for_task",
+    ),
+    BranchService: ("create_branch",),
+    ProjectService: ("get_project_id_by_name",),
+}
+
+
+@pytest.fixture
+def stub_services(monkeypatch):
+    """Replace the service methods handlers call with recording stubs.
+
+    Each stub returns the namespace attribute of the same name (None if
+    unset), so a test sets e.g. `stub_services.get_task_id_by_name = 5`.
+    Calls are recorded in `stub_services.calls` as name -> [(args, kwargs)].
+    """
+    stubs = SimpleNamespace(calls={})
+
+    def make_stub(name):
+        def stub(self, *args, **kwargs):
+            stubs.calls.setdefault(name, []).append((args, kwargs))
+            return getattr(stubs, name, None)
+
+        return stub
+
+    for cls, names in _STUBBED_METHODS.items():
+        patch_many(monkeypatch, cls, **{name: make_stub(name) for name in names})
+    return stubs
+
+
+@pytest.fixture
+def stub_state(monkeypatch):
+    """Keep StateManager's current task and branch in memory for the test.
+
+    Read and set them through `stub_state.task` and `stub_state.branch`.
+    """
+    state = SimpleNamespace(task=None, branch=None)
+
+    def set_task(name):
+        state.task = name
+
+    def set_branch(name):
+        state.branch = name
+
+    patch_many(
+        monkeypatch,
+        StateManager,
+        get_current_task=staticmethod(lambda: state.task),
+        get_current_branch=staticmethod(lambda: state.branch),
+        get_state=staticmethod(lambda: (state.task, state.branch)),
+        set_current_task=staticmethod(set_task),
+        set_current_branch=staticmethod(set_branch),
+    )
+    return state
+
+
+# Modules whose print helpers `capture_prints` replaces
+_PRINTING_MODULES = (output, _common, branch, commit, context, init, project, status, task)
+
+
 @pytest.fixture
 def capture_prints(monkeypatch):
-    """Replace mimir.output print helpers with call-capturing stubs."""
-    calls = {}
+    """Replace mimir.output print helpers with stubs; return the set of those called.
+
+    Handler modules import the helpers by name, so their bindings are replaced
+    as well. Only the names are kept, so printed objects are not held for the
+    test.
+    """
+    called: set[str] = set()
 
     def make_stub(name):
         def stub(*args, **kwargs):
-            calls.setdefault(name, []).append((args, kwargs))
+            called.add(name)
 
         return stub
 
-    import mimir.output as output
-
     for fn in [
         "print_error",
         "print_success",
@@ -50,6 +193,7 @@ def capture_prints(monkeypatch):
         "print_switched",
         "print_branches_list",
         "print_history_table",
+        "print_history_summary",
         "print_commit_details",
         "print_context_concatenated",
         "print_status",
@@ -57,6 +201,9 @@ def capture_prints(monkeypatch):
         "print_dim",
         "print_tasks_list",
     ]:
-        monkeypatch.setattr(output, fn, make_stub(fn))
+        stub = make_stub(fn)
+        for module in _PRINTING_MODULES:
+            if hasattr(module, fn):
+                monkeypatch.setattr(module, fn, stub)
 
-    return calls
+    return called
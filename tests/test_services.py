@@ -1,109 +1,199 @@
 """Unit tests for Mimir."""
 import pytest
+from datetime import datetime
 from pathlib import Path
-from sqlalchemy.orm import Session
+from uuid import uuid4
 
-from mimir.db import DatabaseManager
-from mimir.models import Base, Task, ContextCommit, Branch
-from mimir.services.task_service import TaskService
-from mimir.services.commit_service import CommitService
-from mimir.services.branch_service import BranchService
+from sqlalchemy import event, insert, select
 
-
-@pytest.fixture
-def db_session():
-    """Create a test database session."""
-    # Use SQLite for testing
-    db_manager = DatabaseManager("sqlite:///:memory:")
-    Base.metadata.create_all(db_manager.engine)
-    
-    session = db_manager.get_session()
-    yield session
-    session.close()
+import mimir.services.commit_service as commit_service_module
+from mimir.models import Task, ContextCommit, Branch, Project
+from mimir.db import transaction_cache
+from mimir.handlers._common import get_services
 
 
+# Services come from the per-session container the handlers use. They stay
+# function-scoped: their instance caches must not carry rows from one rolled
+# back test into the next.
 @pytest.fixture
 def task_service(db_session):
     """Create task service."""
-    return TaskService(db_session)
+    return get_services(db_session).task
 
 
 @pytest.fixture
 def commit_service(db_session):
     """Create commit service."""
-    return CommitService(db_session)
+    return get_services(db_session).commit
 
 
 @pytest.fixture
 def branch_service(db_session):
     """Create branch service."""
-    return BranchService(db_session)
+    return get_services(db_session).branch
+
+
+@pytest.fixture
+def project(db_session):
+    """Create the project test tasks belong to."""
+    project = Project(name="proj")
+    db_session.add(project)
+    db_session.flush()
+    return project
+
+
+@pytest.fixture
+def task(task_service, project, db_session):
+    """Create a committed task (rolled back with the test)."""
+    task = task_service.create_task(project.id, "TASK-42")
+    db_session.commit()
+    return task
+
+
+def _create_task_twice(task_service, branch_service, project_id):
+    task_service.create_task(project_id, "TASK-42")
+    task_service.create_task(project_id, "TASK-42")
+
+
+def _create_branch_twice(task_service, branch_service, project_id):
+    task = task_service.create_task(project_id, "TASK-42")
+    branch_service.create_branch(task.id, "feature")
+    branch_service.create_branch(task.id, "feature")
+
+
+def _delete_main_branch(task_service, branch_service, project_id):
+    task = task_service.create_task(project_id, "TASK-42")
+    branch_service.delete_branch(task.id, "main")
+
+
+@pytest.mark.parametrize(
+    "operation, error",
+    [
+        (_create_task_twice, "already exists"),
+        (_create_branch_twice, "already exists"),
+        (_delete_main_branch, "Cannot delete main branch"),
+    ],
+    ids=["duplicate-task", "duplicate-branch", "delete-main-branch"],
+)
+def test_rejected_operations(task_service, branch_service, project, operation, error):
+    """Test operations the services refuse raise ValueError."""
+    with pytest.raises(ValueError, match=error):
+        operation(task_service, branch_service, project.id)
 
 
 class TestTaskService:
     """Tests for TaskService."""
 
-    def test_create_task(self, task_service, db_session):
+    def test_create_task(self, task_service, project, db_session):
         """Test creating a task."""
-        task = task_service.create_task("TASK-42", author="test_user")
+        task = task_service.create_task(project.id, "TASK-42", author="test_user")
         db_session.commit()
 
         assert task.name == "TASK-42"
         assert task.id is not None
 
         # Verify main branch was created
-        branches = db_session.query(Branch).filter(Branch.task_id == task.id).all()
-        assert len(branches) == 1
-        assert branches[0].name == "main"
+        branch_names = db_session.scalars(
+            select(Branch.name).where(Branch.task_id == task.id)
+        ).all()
+        assert branch_names == ["main"]
 
-    def test_create_duplicate_task(self, task_service, db_session):
-        """Test creating duplicate task raises error."""
-        task_service.create_task("TASK-42")
-        
-        with pytest.raises(ValueError, match="already exists"):
-            task_service.create_task("TASK-42")
+    def test_duplicate_task_is_rejected_by_the_insert(
+        self, task_service, project, db_session, engine
+    ):
+        """Test a duplicate name is caught by the INSERT, not by reading tasks first."""
+        task_service.create_task(project.id, "TASK-42")
+        db_session.flush()
+
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
 
-    def test_get_task_by_name(self, task_service, db_session):
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            with pytest.raises(ValueError, match="already exists"):
+                task_service.create_task(project.id, "TASK-42")
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        assert not [s for s in statements if s.lstrip().startswith("SELECT") and "FROM tasks" in s]
+
+    def test_get_task_by_name(self, task_service, project, db_session):
         """Test getting task by name."""
-        created_task = task_service.create_task("TEST-1")
+        created_task = task_service.create_task(project.id, "TEST-1")
         db_session.commit()
 
         retrieved = task_service.get_task_by_name("TEST-1")
         assert retrieved is not None
         assert retrieved.id == created_task.id
 
+    def test_task_id_cache_ends_with_transaction(self, task, task_service, db_session):
+        """Test cached task ids are kept on the session and dropped on commit or close."""
+        for end_transaction in (db_session.commit, db_session.close):
+            assert task_service.get_task_id_by_name("TASK-42") == task.id
+            assert transaction_cache(db_session, "task_ids") == {"TASK-42": task.id}
+
+            end_transaction()
+            assert transaction_cache(db_session, "task_ids") == {}
+
     def test_list_tasks(self, task_service, db_session):
         """Test listing tasks."""
-        task_service.create_task("TASK-1")
-        task_service.create_task("TASK-2")
+        # Only the listing is under test: insert the rows directly
+        project_id = uuid4()
+        db_session.execute(insert(Project), [{"id": project_id, "name": "proj"}])
+        db_session.execute(
+            insert(Task),
+            [
+                {"project_id": project_id, "name": "TASK-1"},
+                {"project_id": project_id, "name": "TASK-2"},
+            ],
+        )
         db_session.commit()
 
         tasks = task_service.list_tasks()
         assert len(tasks) == 2
 
+    def test_list_tasks_with_commit_stats(self, task_service, project, commit_service, db_session):
+        """Test commit counts and last commit time are aggregated per task."""
+        task = task_service.create_task(project.id, "TASK-1")
+        task_service.create_task(project.id, "TASK-2")
+        db_session.commit()
+
+        commit_service.create_commit(task.id, "main", "First", "ctx 1")
+        second = commit_service.create_commit(task.id, "main", "Second", "ctx 2")
+        db_session.commit()
+
+        stats = {
+            row.name: (row.commits_count, row.last_commit_at)
+            for row in task_service.list_tasks_with_commit_stats()
+        }
+        assert stats["TASK-1"] == (2, second.created_at)
+        assert stats["TASK-2"] == (0, None)
+
 
 class TestCommitService:
     """Tests for CommitService."""
 
-    def test_create_commit(self, task_service, commit_service, db_session):
+    @pytest.mark.parametrize(
+        "cognitive_load, uncertainty", [(0, 0), (5, 3), (10, 10), (None, None)]
+    )
+    def test_create_commit(self, task, commit_service, db_session, cognitive_load, uncertainty):
         """Test creating a commit."""
-        task = task_service.create_task("TASK-42")
-        db_session.commit()
-
         commit = commit_service.create_commit(
             task_id=task.id,
             branch_name="main",
             message="Initial context",
             context="This is the context",
             author="alice",
-            cognitive_load=5,
-            uncertainty=3,
+            cognitive_load=cognitive_load,
+            uncertainty=uncertainty,
         )
         db_session.commit()
 
         assert commit.message == "Initial context"
         assert commit.author == "alice"
-        assert commit.cognitive_load == 5
+        assert (commit.cognitive_load, commit.uncertainty) == (cognitive_load, uncertainty)
 
         # Verify branch head was updated
         branch = db_session.query(Branch).filter(
@@ -112,9 +202,9 @@ class TestCommitService:
         ).first()
         assert branch.head_commit_id == commit.id
 
-    def test_create_commit_with_parent(self, task_service, commit_service, db_session):
+    def test_create_commit_with_parent(self, task_service, project, commit_service, db_session):
         """Test creating a commit with parent."""
-        task = task_service.create_task("TASK-42")
+        task = task_service.create_task(project.id, "TASK-42")
         db_session.commit()
 
         # Create first commit
@@ -125,7 +215,6 @@ class TestCommitService:
             context="Context 1",
             author="alice",
         )
-        db_session.commit()
 
         # Create second commit (should have first as parent)
         commit2 = commit_service.create_commit(
@@ -142,9 +231,9 @@ class TestCommitService:
         assert len(parents) == 1
         assert parents[0].id == commit1.id
 
-    def test_get_history(self, task_service, commit_service, db_session):
+    def test_get_history(self, task_service, project, commit_service, db_session):
         """Test getting commit history."""
-        task = task_service.create_task("TASK-42")
+        task = task_service.create_task(project.id, "TASK-42")
         db_session.commit()
 
         # Create multiple commits
@@ -156,14 +245,64 @@ class TestCommitService:
                 context=f"Context {i}",
                 author="alice",
             )
-            db_session.commit()
+        db_session.commit()
 
         history = commit_service.get_history(task.id, "main")
         assert len(history) == 3
 
-    def test_create_commit_invalid_branch(self, task_service, commit_service):
+    def test_iter_history_stops_at_max_depth(self, task, commit_service, db_session, monkeypatch):
+        """Test the full-history walk goes back at most MAX_HISTORY_DEPTH commits."""
+        for i in range(3):
+            commit_service.create_commit(task.id, "main", f"Commit {i}", f"Context {i}")
+        db_session.commit()
+
+        monkeypatch.setattr(commit_service_module, "MAX_HISTORY_DEPTH", 2)
+        history = [c.message for c in commit_service.iter_history(task.id, "main")]
+        assert history == ["Commit 2", "Commit 1"]
+
+    def test_iter_commits_for_task_order(self, task, commit_service, db_session):
+        """Test streamed task commits are ordered in the query, either way, ties by id."""
+        # Insert the rows directly to control created_at: two commits share it
+        first_id, second_id, third_id = sorted(uuid4() for _ in range(3))
+        earlier, later = datetime(2026, 1, 1, 12, 0), datetime(2026, 1, 1, 12, 1)
+        db_session.execute(
+            insert(ContextCommit),
+            [
+                {"id": commit_id, "created_at": created_at, "message": message,
+                 "task_id": task.id, "full_context": "ctx", "author": "alice"}
+                for commit_id, created_at, message in [
+                    (third_id, earlier, "Commit 0"),
+                    (first_id, later, "Commit 1"),
+                    (second_id, later, "Commit 2"),
+                ]
+            ],
+        )
+        db_session.commit()
+
+        oldest_first = [c.message for c in commit_service.iter_commits_for_task(task.id)]
+        newest_first = [
+            c.message for c in commit_service.iter_commits_for_task(task.id, newest_first=True)
+        ]
+        assert oldest_first == ["Commit 0", "Commit 1", "Commit 2"]
+        assert newest_first == list(reversed(oldest_first))
+
+    def test_get_metrics_summary(self, task, commit_service, db_session):
+        """Test metric averages and population deviations, skipping unset values."""
+        for message, load, unc in [("First", 2, 5), ("Second", 6, 5)]:
+            commit_service.create_commit(
+                task.id, "main", message, "ctx", cognitive_load=load, uncertainty=unc
+            )
+        commit_service.create_commit(task.id, "main", "Third", "ctx")
+        db_session.commit()
+
+        summary = commit_service.get_metrics_summary(task.id)
+        assert summary.commits == 3
+        assert (summary.load_avg, summary.load_stddev) == pytest.approx((4.0, 2.0))
+        assert (summary.unc_avg, summary.unc_stddev) == pytest.approx((5.0, 0.0))
+
+    def test_create_commit_invalid_branch(self, task_service, project, commit_service):
         """Test creating commit on non-existent branch."""
-        task = task_service.create_task("TASK-42")
+        task = task_service.create_task(project.id, "TASK-42")
 
         with pytest.raises(ValueError, match="not found"):
             commit_service.create_commit(
@@ -178,10 +317,9 @@ class TestCommitService:
 class TestBranchService:
     """Tests for BranchService."""
 
-    def test_create_branch(self, task_service, branch_service, db_session):
+    def test_create_branch(self, task_service, project, branch_service, db_session):
         """Test creating a branch."""
-        task = task_service.create_task("TASK-42")
-        db_session.commit()
+        task = task_service.create_task(project.id, "TASK-42")
 
         branch = branch_service.create_branch(task.id, "feature")
         db_session.commit()
@@ -189,23 +327,15 @@ class TestBranchService:
         assert branch.name == "feature"
         assert branch.task_id == task.id
 
-    def test_create_duplicate_branch(self, task_service, branch_service, db_session):
-        """Test creating duplicate branch raises error."""
-        task = task_service.create_task("TASK-42")
-        db_session.commit()
-
-        branch_service.create_branch(task.id, "feature")
-        
-        with pytest.raises(ValueError, match="already exists"):
-            branch_service.create_branch(task.id, "feature")
-
-    def test_list_branches(self, task_service, branch_service, db_session):
+    def test_list_branches(self, task_service, project, branch_service, db_session):
         """Test listing branches."""
-        task = task_service.create_task("TASK-42")
+        task = task_service.create_task(project.id, "TASK-42")
         db_session.commit()
 
-        branch_service.create_branch(task.id, "feature1")
-        branch_service.create_branch(task.id, "feature2")
+        # Only the listing is under test: insert the rows directly
+        db_session.add_all(
+            [Branch(task_id=task.id, name="feature1"), Branch(task_id=task.id, name="feature2")]
+        )
         db_session.commit()
 
         branches = branch_service.list_branches(task.id)
@@ -215,9 +345,9 @@ class TestBranchService:
         assert "feature1" in names
         assert "feature2" in names
 
-    def test_delete_branch(self, task_service, branch_service, db_session):
+    def test_delete_branch(self, task_service, project, branch_service, db_session):
         """Test deleting a branch."""
-        task = task_service.create_task("TASK-42")
+        task = task_service.create_task(project.id, "TASK-42")
         db_session.commit()
 
         branch_service.create_branch(task.id, "feature")
@@ -231,16 +361,9 @@ class TestBranchService:
         branch = branch_service.get_branch(task.id, "feature")
         assert branch is None
 
-    def test_cannot_delete_main_branch(self, task_service, branch_service):
-        """Test that main branch cannot be deleted."""
-        task = task_service.create_task("TASK-42")
-
-        with pytest.raises(ValueError, match="Cannot delete main branch"):
-            branch_service.delete_branch(task.id, "main")
-
-    def test_rename_branch(self, task_service, branch_service, db_session):
+    def test_rename_branch(self, task_service, project, branch_service, db_session):
         """Test renaming a branch."""
-        task = task_service.create_task("TASK-42")
+        task = task_service.create_task(project.id, "TASK-42")
         db_session.commit()
 
         branch_service.create_branch(task.id, "old-name")
@@ -257,3 +380,25 @@ class TestBranchService:
 
         assert old is None
         assert new is not None
+
+
+class TestProjectService:
+    """Tests for ProjectService."""
+
+    def test_tree_orders_children_under_parents(self, db_session):
+        """Test the tree is depth-first with siblings in name order."""
+        projects = get_services(db_session).project
+        root = projects.create_project("b-root")
+        projects.create_project("a-root")
+        projects.create_project("z-child", parent_id=root.id)
+        child = projects.create_project("c-child", parent_id=root.id)
+        projects.create_project("grandchild", parent_id=child.id)
+        db_session.commit()
+
+        assert [(row.name, row.depth) for row in projects.tree()] == [
+            ("a-root", 0),
+            ("b-root", 0),
+            ("c-child", 1),
+            ("grandchild", 2),
+            ("z-child", 1),
+        ]